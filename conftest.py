@@ -0,0 +1 @@
+# Puts the repository root on sys.path so tests import ``shared`` the way the pages do.
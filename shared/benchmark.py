@@ -0,0 +1,383 @@
+"""End-to-end benchmarks of the data pages against the local warehouse.
+
+Each case runs one page headlessly with Streamlit's ``AppTest`` for a
+timeframe and a range length ending on ``page.DEFAULT_END_DATE``, with every
+lazy section open, and records:
+
+* per loader (scheduler tasks, lazy sections, rollup stores and range caches)
+  and per warehouse query: wall time, rows returned and DataFrame memory;
+* per chart: figure build time (from the ``px.*`` call or ``go.Figure()`` to
+  ``plotly_chart``), the time ``plotly_chart`` takes to serialize it, the
+  JSON payload size and the number of points sent.
+
+Every case runs twice in one session: ``cold`` after clearing the in-process
+caches and pointing the result cache at an empty directory, then ``warm`` as a
+plain rerun. Results are written as JSON tagged with the git revision, so two
+versions can be compared::
+
+    python -m shared.benchmark --rows 1000000 --out .cache/benchmarks/before.json
+    python -m shared.benchmark --rows 1000000 --compare .cache/benchmarks/before.json
+
+The warehouse is ``shared.local_warehouse`` (generated first if missing), so
+this needs ``duckdb`` (``pip install -r requirements-dev.txt``).
+"""
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from shared.page import DEFAULT_END_DATE, DEFAULT_START_DATE
+
+ROOT = Path(__file__).resolve().parent.parent
+
+PAGES = {
+    "metrics": {
+        "path": ROOT / "pages" / "1_📐Metrics.py",
+        "timeframe_key": "metrics_timeframe",
+        "sections": ["metrics_gas_fees"],
+    },
+    "squid": {
+        "path": ROOT / "pages" / "2_🟡Squid.py",
+        "timeframe_key": "squid_timeframe",
+        "sections": ["squid_top_source", "squid_top_dest", "squid_source_symbols", "squid_dest_symbols"],
+    },
+}
+
+# the pages' default view, inclusive of both ends, so the last case hits the keys shared.prewarm fills
+DEFAULT_WINDOW_DAYS = (pd.Timestamp(DEFAULT_END_DATE) - pd.Timestamp(DEFAULT_START_DATE)).days + 1
+DEFAULT_RANGES = (7, 30, 90, 365, DEFAULT_WINDOW_DAYS)  # days ending on page.DEFAULT_END_DATE
+DEFAULT_TIMEOUT = 600                   # seconds AppTest waits for one run
+PX_FUNCTIONS = ("bar", "scatter", "line", "area", "pie", "histogram")
+PASSES = ("cold", "warm")
+
+_local = threading.local()
+
+
+# --- Recording ----------------------------------------------------------------------------------------------------
+class Recorder:
+    """Collects the loader, query and figure measurements of one page run."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.loaders = []
+        self.figures = []
+
+    def add_loader(self, name, kind, seconds, result):
+        rows, nbytes = _frame_stats(result)
+        with self._lock:
+            self.loaders.append({"name": name, "kind": kind, "seconds": seconds, "rows": rows, "bytes": nbytes})
+
+    def add_figure(self, figure, build_s, serialize_s):
+        import plotly.io as pio
+
+        title = figure.layout.title.text
+        payload = len(pio.to_json(figure, validate=False).encode("utf-8"))
+        points = sum(len(trace.x) for trace in figure.data if getattr(trace, "x", None) is not None)
+        with self._lock:
+            self.figures.append({
+                "title": title, "build_s": build_s, "serialize_s": serialize_s,
+                "payload_bytes": payload, "points": points,
+            })
+
+
+_recorder = None
+
+
+def _frame_stats(result):
+    from shared.cache_policy import sizeof
+
+    frames = result.values() if isinstance(result, dict) else [result]
+    frames = [frame for frame in frames if isinstance(frame, pd.DataFrame)]
+    if not frames:
+        return None, None
+    return sum(len(frame) for frame in frames), sum(sizeof(frame) for frame in frames)
+
+
+def _timed(name, kind, fn):
+    def run(*args, **kwargs):
+        started = time.perf_counter()
+        result = fn(*args, **kwargs)
+        if _recorder is not None:
+            _recorder.add_loader(name, kind, time.perf_counter() - started, result)
+        return result
+    return run
+
+
+def _query_names():
+    from shared.query_builder import TEMPLATES
+
+    return {sql: t.name for t in list(TEMPLATES.values()) for sql in list(t._compiled.values())}
+
+
+@contextlib.contextmanager
+def _patched(target, attribute, replacement):
+    original = getattr(target, attribute)
+    setattr(target, attribute, replacement(original))
+    try:
+        yield
+    finally:
+        setattr(target, attribute, original)
+
+
+@contextlib.contextmanager
+def instrument():
+    """Patch the scheduler, caches, warehouse fetch and Plotly hooks to report to ``_recorder``."""
+    import plotly.express as px
+    import plotly.graph_objects as go
+    import streamlit as st
+    from streamlit.delta_generator import DeltaGenerator
+
+    from shared import connection
+    from shared.range_cache import RangeCache
+    from shared.rollup import RollupStore
+    from shared.scheduler import QueryScheduler
+
+    def submit(original):
+        # integer names are run_concurrently's parts, already covered by the store or query they call
+        def wrapper(self, name, fn, *args, **kwargs):
+            if isinstance(name, str):
+                fn = _timed(name, "loader", fn)
+            return original(self, name, fn, *args, **kwargs)
+        return wrapper
+
+    def window(original):
+        def wrapper(self, start, end):
+            return _timed(self.name, "rollup", original)(self, start, end)
+        return wrapper
+
+    def get(original):
+        def wrapper(self, timeframe, start_date, end_date):
+            return _timed(f"{self._spans.name}:{timeframe}", "range_cache", original)(self, timeframe, start_date, end_date)
+        return wrapper
+
+    def fetch_frame(original):
+        def wrapper(conn, query, params=None):
+            name = _query_names().get(query, "query")
+            return _timed(name, "query", original)(conn, query, params)
+        return wrapper
+
+    def px_function(original):
+        def wrapper(*args, **kwargs):
+            _local.px_started = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                _local.px_started = None
+        return wrapper
+
+    def figure_init(original):
+        def wrapper(self, *args, **kwargs):
+            started = getattr(_local, "px_started", None) or time.perf_counter()
+            original(self, *args, **kwargs)
+            self._benchmark_started = started
+        return wrapper
+
+    def plotly_chart(figure_index):
+        def wrap(original):
+            def wrapper(*args, **kwargs):
+                figure = args[figure_index] if len(args) > figure_index else kwargs.get("figure_or_data")
+                started = time.perf_counter()
+                result = original(*args, **kwargs)
+                if _recorder is not None and isinstance(figure, go.Figure):
+                    build_s = started - getattr(figure, "_benchmark_started", started)
+                    _recorder.add_figure(figure, build_s, time.perf_counter() - started)
+                return result
+            return wrapper
+        return wrap
+
+    with contextlib.ExitStack() as stack:
+        stack.enter_context(_patched(QueryScheduler, "submit", submit))
+        stack.enter_context(_patched(RollupStore, "window", window))
+        stack.enter_context(_patched(RangeCache, "get", get))
+        stack.enter_context(_patched(connection, "fetch_frame", fetch_frame))
+        stack.enter_context(_patched(go.Figure, "__init__", figure_init))
+        for name in PX_FUNCTIONS:
+            stack.enter_context(_patched(px, name, px_function))
+        # st.plotly_chart is bound to the main container at import, so it is patched on its own
+        stack.enter_context(_patched(DeltaGenerator, "plotly_chart", plotly_chart(1)))
+        stack.enter_context(_patched(st, "plotly_chart", plotly_chart(0)))
+        yield
+
+
+# --- Running ------------------------------------------------------------------------------------------------------
+def clear_caches(result_dir):
+    """Forget everything cached in this process and point the result cache at ``result_dir``."""
+    import streamlit as st
+
+    from shared.cache_policy import CACHES, LRUCache
+    from shared.disk_cache import get_result_cache
+
+    st.cache_resource.clear()
+    st.cache_data.clear()
+    for cache in list(CACHES.values()):
+        if isinstance(cache, LRUCache):
+            cache.clear()
+    os.environ["AXELAR_RESULT_CACHE_DIR"] = str(result_dir)
+    get_result_cache.cache_clear()
+
+
+def _date_window(days):
+    end = pd.Timestamp(DEFAULT_END_DATE).date()
+    return end - datetime.timedelta(days=days - 1), end
+
+
+def run_case(page, timeframe, days, result_dir, timeout=DEFAULT_TIMEOUT):
+    """Run ``page`` cold and then warm; returns one result dict per pass."""
+    global _recorder
+    from streamlit.testing.v1 import AppTest
+
+    from shared.page import END_DATE_KEY, START_DATE_KEY
+
+    spec = PAGES[page]
+    start_date, end_date = _date_window(days)
+    clear_caches(result_dir)
+    at = AppTest.from_file(str(spec["path"]), default_timeout=timeout)
+    at.session_state[START_DATE_KEY] = start_date
+    at.session_state[END_DATE_KEY] = end_date
+    at.session_state[spec["timeframe_key"]] = timeframe
+    for key in spec["sections"]:
+        at.session_state[key] = True
+
+    results = []
+    for run_pass in PASSES:
+        _recorder = Recorder()
+        started = time.perf_counter()
+        try:
+            at.run()
+        finally:
+            recorder, _recorder = _recorder, None
+        results.append({
+            "page": page,
+            "timeframe": timeframe,
+            "days": days,
+            "start_date": start_date.isoformat(),
+            "end_date": end_date.isoformat(),
+            "pass": run_pass,
+            "run_s": time.perf_counter() - started,
+            "exceptions": [str(e.value) for e in at.exception],
+            "loaders": recorder.loaders,
+            "figures": recorder.figures,
+        })
+    return results
+
+
+def _git_revision():
+    try:
+        revision = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True,
+                                  check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return revision + ("-dirty" if dirty else "")
+
+
+def run(pages=tuple(PAGES), timeframes=None, ranges=DEFAULT_RANGES, db=None, rows=None, timeout=DEFAULT_TIMEOUT):
+    """Benchmark every ``page x timeframe x range`` case; returns the baseline document."""
+    import streamlit
+
+    from shared import connection, local_warehouse, synthetic
+    from shared.timeframes import TIMEFRAMES
+
+    os.environ["AXELAR_BACKEND"] = "local"
+    os.environ["AXELAR_PREWARM"] = "0"  # a background pass would race the cold runs
+    if db is not None:
+        os.environ["AXELAR_LOCAL_DB"] = str(db)
+    path = local_warehouse.local_db_path(connection.backend_settings())
+    if not path.exists():
+        synthetic.generate(path, rows=rows or synthetic.DEFAULT_ROWS)
+
+    cases = []
+    with instrument(), tempfile.TemporaryDirectory(prefix="axelar-benchmark-") as scratch:
+        for page in pages:
+            for timeframe in timeframes or TIMEFRAMES:
+                for days in ranges:
+                    result_dir = Path(scratch) / f"{page}-{timeframe}-{days}"
+                    cases.extend(run_case(page, timeframe, days, result_dir, timeout))
+                    print(f"{page:8} {timeframe:5} {days:4}d  " + "  ".join(
+                        f"{case['pass']} {case['run_s']:.2f}s" for case in cases[-len(PASSES):]))
+    return {
+        "revision": _git_revision(),
+        "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "database": {"path": str(path), "bytes": path.stat().st_size},
+        "python": platform.python_version(),
+        "streamlit": streamlit.__version__,
+        "cases": cases,
+    }
+
+
+# --- Reporting ----------------------------------------------------------------------------------------------------
+def summarize(baseline):
+    """One row per case: run time, loader and query totals, and chart payload."""
+    rows = []
+    for case in baseline["cases"]:
+        loaders = pd.DataFrame(case["loaders"], columns=["name", "kind", "seconds", "rows", "bytes"])
+        figures = pd.DataFrame(case["figures"], columns=["title", "build_s", "serialize_s", "payload_bytes", "points"])
+        queries = loaders[loaders["kind"] == "query"]
+        rows.append({
+            "page": case["page"],
+            "timeframe": case["timeframe"],
+            "days": case["days"],
+            "pass": case["pass"],
+            "run_s": case["run_s"],
+            "queries": len(queries),
+            "query_s": queries["seconds"].sum(),
+            "query_rows": queries["rows"].sum(),
+            "figures": len(figures),
+            "build_s": figures["build_s"].sum(),
+            "serialize_s": figures["serialize_s"].sum(),
+            "payload_kb": figures["payload_bytes"].sum() / 1024,
+            "errors": len(case["exceptions"]),
+        })
+    return pd.DataFrame(rows)
+
+
+def compare(baseline, current):
+    """``summarize`` of both runs side by side, with ``current / baseline`` ratios."""
+    keys = ["page", "timeframe", "days", "pass"]
+    merged = summarize(baseline).merge(summarize(current), on=keys, suffixes=("_before", "_after"))
+    for column in ("run_s", "query_s", "build_s", "payload_kb"):
+        merged[f"{column}_ratio"] = merged[f"{column}_after"] / merged[f"{column}_before"]
+    return merged[keys + [f"{c}_{s}" for c in ("run_s", "payload_kb") for s in ("before", "after", "ratio")]
+                  + ["query_s_ratio", "build_s_ratio"]]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", nargs="+", choices=list(PAGES), default=list(PAGES))
+    parser.add_argument("--timeframes", nargs="+", default=None, help="default: all of timeframes.TIMEFRAMES")
+    parser.add_argument("--ranges", nargs="+", type=int, default=list(DEFAULT_RANGES), help="range lengths in days")
+    parser.add_argument("--db", default=None, help="DuckDB file (default: AXELAR_LOCAL_DB or .cache/axelar.duckdb)")
+    parser.add_argument("--rows", type=int, default=None, help="rows to generate if the database is missing")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT)
+    parser.add_argument("--out", default=None, help="default: .cache/benchmarks/<revision>.json")
+    parser.add_argument("--compare", default=None, help="baseline JSON to compare this run against")
+    args = parser.parse_args(argv)
+
+    # AppTest runs the pages without a browser session, so Streamlit warns on every element
+    from streamlit.logger import set_log_level
+    set_log_level("error")
+    baseline = run(args.pages, args.timeframes, args.ranges, args.db, args.rows, args.timeout)
+    out = Path(args.out or ROOT / ".cache" / "benchmarks" / f"{baseline['revision'] or 'unknown'}.json")
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(baseline, indent=2, default=str))
+
+    with pd.option_context("display.width", 200, "display.max_columns", None, "display.float_format", "{:.3f}".format):
+        print(summarize(baseline).to_string(index=False))
+        if args.compare:
+            print()
+            print(compare(json.loads(Path(args.compare).read_text()), baseline).to_string(index=False))
+    print(f"Wrote {len(baseline['cases'])} cases to {out}")
+
+
+if __name__ == "__main__":
+    main()
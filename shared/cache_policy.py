@@ -0,0 +1,165 @@
+"""TTL + LRU cache policy shared by every dashboard cache.
+
+Each cache is registered under a name with a policy (``ttl`` seconds,
+``max_entries``, ``max_bytes``); the defaults below can be overridden per name
+in ``.streamlit/secrets.toml``::
+
+    [cache.chain_stats]
+    ttl = 900
+    max_entries = 16
+
+Entries are evicted least-recently-used first whenever either bound is
+exceeded, and every cache keeps hit/miss/eviction counters (``cache_stats``).
+"""
+import functools
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+from shared import profiler
+from shared.settings import settings
+
+MB = 1024 * 1024
+
+# ``open_ttl`` applies to data that can still change (periods/days reaching today),
+# ``disk_ttl`` to final results in the on-disk cache (see shared.disk_cache)
+DEFAULT_POLICY = {
+    "ttl": 3600,
+    "open_ttl": 600,
+    "disk_ttl": 7 * 24 * 3600,
+    "max_entries": 64,
+    "max_bytes": 64 * MB,
+}
+
+LOADER_POLICIES = {
+    "chain_stats": {"ttl": 3600, "max_entries": 32, "max_bytes": 1 * MB},
+    # one entry per cached period span
+    "txn_metrics": {"ttl": 6 * 3600, "max_entries": 4096, "max_bytes": 32 * MB},
+    # a single store: closed days never expire, the open day is re-read after
+    # ``open_ttl`` and the oldest days are trimmed past ``max_bytes``
+    "squid_rollup": {"max_bytes": 256 * MB},
+    "squid_users": {"max_bytes": 64 * MB},
+    "block_summary": {"max_bytes": 8 * MB},
+    "address_sketches": {"max_bytes": 64 * MB},
+}
+
+CACHES = {}
+_registry_lock = threading.Lock()
+
+
+def get_policy(name):
+    policy = dict(DEFAULT_POLICY, **LOADER_POLICIES.get(name, {}))
+    policy.update(settings("cache").get(name, {}))
+    return policy
+
+
+def sizeof(value):
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    return sys.getsizeof(value)
+
+
+class LRUCache:
+    def __init__(self, name, ttl=None, max_entries=None, max_bytes=None):
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (expires_at, nbytes, value)
+        self._lock = threading.Lock()
+        self.nbytes = 0
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+    @classmethod
+    def for_policy(cls, name):
+        with _registry_lock:
+            if name not in CACHES:
+                policy = get_policy(name)
+                CACHES[name] = cls(name, policy["ttl"], policy["max_entries"], policy["max_bytes"])
+            return CACHES[name]
+
+    def _drop(self, key):
+        _, nbytes, _ = self._entries.pop(key)
+        self.nbytes -= nbytes
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            if time.monotonic() > entry[0]:
+                self._drop(key)
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else float("inf")
+        nbytes = sizeof(value)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (expires_at, nbytes, value)
+            self.nbytes += nbytes
+            while self._entries and (
+                (self.max_entries is not None and len(self._entries) > self.max_entries)
+                or (self.max_bytes is not None and self.nbytes > self.max_bytes)
+            ):
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def stats(self):
+        return {
+            "cache": self.name,
+            "entries": len(self._entries),
+            "bytes": self.nbytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+_MISSING = object()
+
+
+def cached(name):
+    """Drop-in replacement for ``@st.cache_data`` that follows the named policy.
+
+    Cached DataFrames are returned as-is (not copied), so callers must not
+    mutate them.
+    """
+    def decorator(fn):
+        cache = LRUCache.for_policy(name)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            with profiler.span(name, "cache"):
+                value = cache.get(key, _MISSING)
+                profiler.annotate(cache="miss" if value is _MISSING else "hit")
+                if value is _MISSING:
+                    value = fn(*args, **kwargs)
+                    cache.set(key, value)
+            return value
+
+        wrapper.cache = cache
+        return wrapper
+    return decorator
+
+
+def cache_stats():
+    return pd.DataFrame([cache.stats() for cache in CACHES.values()])
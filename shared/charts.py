@@ -0,0 +1,74 @@
+"""Keep chart payloads proportional to the chart's width instead of the date range.
+
+Every point of a Plotly figure is serialized to JSON and drawn by the
+browser, but a chart can't show more points than it has pixels. Before a
+frame goes to a figure it is reduced to about one point per horizontal pixel
+of its column:
+
+* lines use Largest-Triangle-Three-Buckets (LTTB), which keeps the first and
+  last points and the visually significant peaks and troughs;
+* bars are averaged over equal-width buckets of consecutive periods, so the
+  y-axis keeps its per-period scale;
+* scatter figures that are still large after downsampling use WebGL traces.
+
+Narrowing the date inputs re-renders at full resolution once the window fits.
+The "Full-resolution charts" toggle turns downsampling off.
+"""
+import numpy as np
+import pandas as pd
+
+PAGE_WIDTH_PX = 1200      # plot area of the wide layout, split across a row's columns
+WEBGL_THRESHOLD = 500     # scatter traces above this many points are drawn with WebGL
+
+
+def max_points(columns=1, full_resolution=False):
+    """Point budget for a chart in a row of ``columns``; ``None`` means no limit."""
+    return None if full_resolution else PAGE_WIDTH_PX // columns
+
+
+def _as_numbers(values):
+    values = pd.Series(values)
+    if pd.api.types.is_datetime64_any_dtype(values):
+        values = values.astype("int64")
+    return np.nan_to_num(values.to_numpy(dtype=np.float64))
+
+
+def lttb_indices(x, y, threshold):
+    """Row positions LTTB keeps out of ``len(x)`` points."""
+    n = len(x)
+    if threshold is None or n <= threshold or threshold < 3:
+        return np.arange(n)
+    x, y = _as_numbers(x), _as_numbers(y)
+    every = (n - 2) / (threshold - 2)
+    kept = np.empty(threshold, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = int(i * every) + 1, int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        avg_x, avg_y = x[end:next_end].mean(), y[end:next_end].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        kept[i + 1] = a
+    return kept
+
+
+def lttb(df, x, y, threshold):
+    """Rows of ``df`` that LTTB keeps for the ``y`` line over ``x``."""
+    if threshold is None or len(df) <= threshold:
+        return df
+    return df.iloc[lttb_indices(df[x], df[y], threshold)]
+
+
+def bucket(df, x, threshold, how="mean"):
+    """Aggregate consecutive rows into at most ``threshold`` bars labelled by their first ``x``."""
+    if threshold is None or len(df) <= threshold:
+        return df
+    size = -(-len(df) // threshold)
+    groups = np.arange(len(df)) // size
+    numeric = [column for column in df.select_dtypes("number").columns if column != x]
+    return df.groupby(groups).agg({x: "first", **{column: how for column in numeric}}).reset_index(drop=True)
+
+
+def render_mode(df):
+    return "webgl" if len(df) > WEBGL_THRESHOLD else "svg"
@@ -0,0 +1,158 @@
+"""On-disk result cache shared across restarts and replicas.
+
+Query results are written as Arrow IPC (Feather v2) files keyed by the
+normalized SQL text plus its parameters. Each file has a JSON sidecar holding
+its SHA-256, creation time and expiry; a file whose checksum does not match,
+or whose expiry has passed, is treated as a miss and removed. Writes go to a
+temporary file first and are moved into place atomically, so several
+replicas can share one volume.
+
+The directory comes from ``AXELAR_RESULT_CACHE_DIR`` or ``[disk_cache] path``
+in secrets (default ``.cache/results``); ``[disk_cache] enabled = false``
+turns it off.
+"""
+import functools
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from shared.cache_policy import get_policy
+from shared.settings import settings
+from shared.timeframes import today
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DIR = Path(__file__).resolve().parent.parent / ".cache" / "results"
+
+# committed entries are named after their key; anything else is another writer's temporary file
+_KEY_RE = re.compile(r"[0-9a-f]{64}")
+
+
+def normalize_sql(query):
+    return re.sub(r"\s+", " ", query).strip()
+
+
+def cache_key(query, params=None):
+    payload = json.dumps([normalize_sql(query), params], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def window_ttl(name, end_date):
+    """Results ending before yesterday are final and kept for ``disk_ttl``."""
+    policy = get_policy(name)
+    if pd.Timestamp(end_date).normalize() >= today() - pd.Timedelta(days=1):
+        return policy["open_ttl"]
+    return policy["disk_ttl"]
+
+
+class DiskCache:
+    def __init__(self, directory, default_ttl):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.default_ttl = default_ttl
+
+    def _paths(self, key):
+        return self.directory / f"{key}.arrow", self.directory / f"{key}.json"
+
+    def _remove(self, key):
+        for path in self._paths(key):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def get(self, query, params=None):
+        key = cache_key(query, params)
+        data_path, meta_path = self._paths(key)
+        try:
+            meta = json.loads(meta_path.read_text())
+        except (FileNotFoundError, ValueError):
+            return None
+        if time.time() > meta["expires_at"]:
+            self._remove(key)
+            return None
+        try:
+            if _sha256(data_path) != meta["sha256"]:
+                logger.warning("Checksum mismatch for cached result %s, discarding", key)
+                self._remove(key)
+                return None
+            return feather.read_feather(data_path)
+        except (OSError, pa.ArrowException):
+            self._remove(key)
+            return None
+
+    def expires_at(self, query, params=None):
+        """When the entry for ``query`` expires (epoch seconds), or ``None`` if there is none."""
+        _, meta_path = self._paths(cache_key(query, params))
+        try:
+            return json.loads(meta_path.read_text())["expires_at"]
+        except (FileNotFoundError, ValueError, KeyError):
+            return None
+
+    def set(self, query, df, params=None, ttl=None):
+        key = cache_key(query, params)
+        data_path, meta_path = self._paths(key)
+        ttl = self.default_ttl if ttl is None else ttl
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        os.close(fd)
+        meta_tmp = f"{tmp_path}.json"
+        try:
+            feather.write_feather(df, tmp_path)
+            meta = {
+                "sha256": _sha256(tmp_path),
+                "created_at": time.time(),
+                "expires_at": time.time() + ttl,
+                "rows": len(df),
+                "query": normalize_sql(query)[:200],
+            }
+            os.replace(tmp_path, data_path)
+            # the sidecar goes last: readers never see metadata for a missing file
+            Path(meta_tmp).write_text(json.dumps(meta))
+            os.replace(meta_tmp, meta_path)
+        except (OSError, pa.ArrowException, TypeError, ValueError) as exc:
+            logger.warning("Could not write cached result %s: %s", key, exc)
+            self._remove(key)
+        finally:
+            for path in (tmp_path, meta_tmp):
+                if os.path.exists(path):
+                    os.unlink(path)
+
+    def purge_expired(self):
+        now = time.time()
+        for meta_path in self.directory.glob("*.json"):
+            if not _KEY_RE.fullmatch(meta_path.stem):
+                continue
+            try:
+                expired = now > json.loads(meta_path.read_text())["expires_at"]
+            except (OSError, ValueError, KeyError):
+                expired = True
+            if expired:
+                self._remove(meta_path.stem)
+
+
+@functools.lru_cache(maxsize=None)
+def get_result_cache():
+    disk_cache = settings("disk_cache", path="AXELAR_RESULT_CACHE_DIR")
+    if not disk_cache.get("enabled", True):
+        return None
+    directory = disk_cache.get("path") or DEFAULT_DIR
+    cache = DiskCache(directory, default_ttl=get_policy("disk")["disk_ttl"])
+    cache.purge_expired()
+    return cache
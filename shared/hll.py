@@ -0,0 +1,141 @@
+"""Mergeable HyperLogLog sketches for distinct-user counts.
+
+Per-day (or per-group) sketches come from Snowflake's
+``HLL_EXPORT(HLL_ACCUMULATE(col))``, which returns precision-12 registers in
+either a ``sparse`` (``indices`` / ``maxLzCounts``) or a ``dense`` layout.
+Register values are the usual HLL rank (leading zeros + 1, 0 = empty), so the
+union of any set of sketches is the element-wise max of their registers and
+the count is the standard HLL estimate.
+
+With 2^12 registers the relative standard error is 1.04 / sqrt(4096) ~ 1.6%,
+so unique-user figures built from sketches are within ~3.3% of the exact
+COUNT(DISTINCT) about 95% of the time.
+
+Sketches are kept sparse (only non-empty registers) because most rollup
+groups see a handful of users. ``from_values`` and ``from_hashes`` build
+sketches locally with a different hash than Snowflake's; local and exported
+sketches must not be mixed in one union.
+"""
+import hashlib
+import json
+
+import numpy as np
+import pandas as pd
+
+PRECISION = 12
+REGISTERS = 1 << PRECISION
+RELATIVE_ERROR = 1.04 / np.sqrt(REGISTERS)
+
+
+class Sketch:
+    __slots__ = ("indices", "values")
+
+    def __init__(self, indices, values):
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.values = np.asarray(values, dtype=np.uint8)
+
+    def __sizeof__(self):
+        return object.__sizeof__(self) + self.indices.nbytes + self.values.nbytes
+
+
+EMPTY = Sketch([], [])
+
+
+def from_export(value):
+    """Parse one ``HLL_EXPORT`` object (JSON text or dict)."""
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return EMPTY
+    if isinstance(value, str):
+        value = json.loads(value)
+    if value.get("precision", PRECISION) != PRECISION:
+        raise ValueError(f"Expected HLL precision {PRECISION}, got {value['precision']}")
+    if "sparse" in value:
+        return Sketch(value["sparse"]["indices"], value["sparse"]["maxLzCounts"])
+    dense = np.asarray(value["dense"], dtype=np.uint8)
+    indices = np.flatnonzero(dense)
+    return Sketch(indices, dense[indices])
+
+
+def from_values(values):
+    registers = np.zeros(REGISTERS, dtype=np.uint8)
+    for item in pd.unique(pd.Series(values).dropna()):
+        h = int.from_bytes(hashlib.blake2b(str(item).encode("utf-8"), digest_size=8).digest(), "big")
+        index = h >> (64 - PRECISION)
+        rest = h & ((1 << (64 - PRECISION)) - 1)
+        rank = (64 - PRECISION) - rest.bit_length() + 1
+        registers[index] = max(registers[index], rank)
+    indices = np.flatnonzero(registers)
+    return Sketch(indices, registers[indices])
+
+
+def from_hashes(hashes):
+    """Sketch of already-hashed 64-bit values (the local warehouse's ``HLL_ACCUMULATE``)."""
+    hashes = np.asarray(hashes, dtype=np.uint64)
+    index = (hashes >> np.uint64(64 - PRECISION)).astype(np.int64)
+    rest = hashes & np.uint64((1 << (64 - PRECISION)) - 1)
+    # rest < 2**52 is exact as a float, so frexp's exponent is its bit length
+    rank = (64 - PRECISION) - np.frexp(rest.astype(np.float64))[1] + 1
+    registers = np.zeros(REGISTERS, dtype=np.uint8)
+    np.maximum.at(registers, index, rank.astype(np.uint8))
+    indices = np.flatnonzero(registers)
+    return Sketch(indices, registers[indices])
+
+
+def to_export(sketch):
+    """Inverse of ``from_export`` (sparse layout)."""
+    return json.dumps({
+        "version": 4,
+        "precision": PRECISION,
+        "sparse": {"indices": sketch.indices.tolist(), "maxLzCounts": sketch.values.tolist()},
+    })
+
+
+def union(sketches):
+    sketches = list(sketches)
+    registers = np.zeros(REGISTERS, dtype=np.uint8)
+    if sketches:
+        np.maximum.at(
+            registers,
+            np.concatenate([s.indices for s in sketches]),
+            np.concatenate([s.values for s in sketches]),
+        )
+    return registers
+
+
+def union_by(codes, sketches, groups):
+    """Union per group: ``(groups, REGISTERS)`` registers, sketch ``i`` going to row ``codes[i]``.
+
+    One scatter-max over every sketch's registers, instead of a union per group.
+    """
+    sketches = list(sketches)
+    registers = np.zeros((groups, REGISTERS), dtype=np.uint8)
+    if sketches:
+        lengths = [len(s.indices) for s in sketches]
+        rows = np.repeat(np.asarray(codes, dtype=np.int64), lengths)
+        np.maximum.at(
+            registers,
+            (rows, np.concatenate([s.indices for s in sketches])),
+            np.concatenate([s.values for s in sketches]),
+        )
+    return registers
+
+
+def estimate(registers):
+    """Count for one register array, or one count per row of a 2-D array."""
+    alpha = 0.7213 / (1 + 1.079 / REGISTERS)
+    raw = alpha * REGISTERS ** 2 / np.sum(np.exp2(-registers.astype(np.float64)), axis=-1)
+    zeros = np.count_nonzero(registers == 0, axis=-1)
+    with np.errstate(divide="ignore"):
+        linear = REGISTERS * np.log(REGISTERS / np.maximum(zeros, 1))
+    counts = np.rint(np.where((raw <= 2.5 * REGISTERS) & (zeros > 0), linear, raw)).astype(np.int64)
+    return int(counts) if counts.ndim == 0 else counts
+
+
+def count_distinct(sketches):
+    return estimate(union(sketches))
+
+
+def count_distinct_by(keys, sketches):
+    """Distinct count of the union per distinct value of ``keys`` (NaN is a group), as a Series."""
+    codes, groups = pd.factorize(pd.Series(keys), use_na_sentinel=False)
+    return pd.Series(estimate(union_by(codes, sketches, len(groups))), index=groups)
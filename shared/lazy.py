@@ -0,0 +1,44 @@
+"""Below-the-fold rows that load and render only when opened.
+
+Each section is an ``st.expander(on_change="rerun")``. A closed section
+builds no figures; its loader is submitted to the query pool instead (see
+``shared.scheduler``) and the future is kept in session state, so opening the
+section on the next rerun usually finds its data ready. Sections are declared
+after the KPI rows, so prefetching starts once the above-the-fold content is
+on screen.
+"""
+import streamlit as st
+
+from shared import profiler
+from shared.scheduler import QueryScheduler
+
+_PREFETCH_KEY = "_lazy_prefetch"
+
+
+def _futures():
+    return st.session_state.setdefault(_PREFETCH_KEY, {})
+
+
+def prefetch(key, load, *args):
+    """Start ``load(*args)`` in the background unless it is already running for these args.
+
+    A future that failed is replaced, so one transient error doesn't stick to the section.
+    """
+    futures = _futures()
+    stale = key in futures and futures[key][1].done() and futures[key][1].exception() is not None
+    if key not in futures or futures[key][0] != args or stale:
+        futures[key] = (args, QueryScheduler().submit(key, load, *args))
+    return futures[key][1]
+
+
+def section(label, key, render, load, *args):
+    """Expander that calls ``render(load(*args))`` only while it is open."""
+    expander = st.expander(label, key=key, on_change="rerun")
+    if expander.open is False:
+        prefetch(key, load, *args)
+        return
+    with expander:
+        with st.spinner(f"Loading {label.lower()}..."), profiler.span(f"wait {key}", "wait"):
+            data = prefetch(key, load, *args).result()
+        with profiler.span(f"render {key}", "render"):
+            render(data)
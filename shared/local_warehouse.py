@@ -0,0 +1,174 @@
+"""Embedded DuckDB stand-in for the Snowflake warehouse.
+
+With ``AXELAR_BACKEND=local`` (or ``[backend] kind = "local"`` in secrets)
+``shared.connection`` runs every query against a DuckDB file of synthetic
+data (see ``shared.synthetic``) instead of the Snowflake pool, so the pages,
+loaders and caches can be exercised and measured offline. The file comes
+from ``AXELAR_LOCAL_DB`` or ``[backend] path`` (default
+``.cache/axelar.duckdb``) and is generated on first use if missing. Needs
+``duckdb``, which is in ``requirements-dev.txt`` and not in the deployed app's
+``requirements.txt``.
+
+Queries are the same compiled templates, with ``?`` binds, rewritten for
+DuckDB by ``translate``:
+
+* VARIANT paths (``data:send:amount``, ``data:call.chain::STRING``) become
+  ``json_extract_string`` on the JSON ``data`` column, which yields arrays and
+  objects as JSON text;
+* ``HLL_EXPORT(HLL_ACCUMULATE(x))`` becomes a UDF over ``hash(x)`` that
+  returns the same sparse export JSON (see ``hll.from_hashes``);
+* ``DATEDIFF(part, ...)`` and ``DATE_PART(epoch_second, ...)`` are renamed;
+* ``TRY_TO_DOUBLE``, ``IFF``, and ``IS_ARRAY`` / ``IS_OBJECT`` (a
+  ``json_type`` check on that text) are connection macros. ``DATE_TRUNC``,
+  ``MEDIAN``, ``LEAD``, ``POW`` and ``::date`` work as they are.
+"""
+import re
+import threading
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+import pyarrow as pa
+
+from shared import hll
+
+DEFAULT_PATH = Path(__file__).resolve().parent.parent / ".cache" / "axelar.duckdb"
+
+VARIANT_COLUMNS = ("data",)
+
+MACROS = (
+    "CREATE OR REPLACE TEMP MACRO try_to_double(x) AS TRY_CAST(x AS DOUBLE)",
+    "CREATE OR REPLACE TEMP MACRO iff(condition, a, b) AS CASE WHEN condition THEN a ELSE b END",
+    "CREATE OR REPLACE TEMP MACRO is_array(x) AS CASE WHEN json_valid(x) THEN json_type(x::JSON) = 'ARRAY' ELSE FALSE END",
+    "CREATE OR REPLACE TEMP MACRO is_object(x) AS CASE WHEN json_valid(x) THEN json_type(x::JSON) = 'OBJECT' ELSE FALSE END",
+)
+
+_PATH_RE = re.compile(
+    r"\b({columns})((?::[A-Za-z_]\w*(?:\.[A-Za-z_]\w*)*)+)(?:::STRING\b)?".format(columns="|".join(VARIANT_COLUMNS)),
+    re.IGNORECASE,
+)
+_DATEDIFF_RE = re.compile(r"\bDATEDIFF\(\s*(\w+)\s*,", re.IGNORECASE)
+_EPOCH_RE = re.compile(r"\bDATE_PART\(\s*epoch_second\s*,", re.IGNORECASE)
+_HLL_RE = re.compile(r"\bHLL_EXPORT\(\s*HLL_ACCUMULATE\(", re.IGNORECASE)
+
+
+def _json_path(path):
+    return "$." + path.lstrip(":").replace(":", ".")
+
+
+def _closing_paren(text, start):
+    depth = 1
+    for i in range(start, len(text)):
+        depth += {"(": 1, ")": -1}.get(text[i], 0)
+        if depth == 0:
+            return i
+    raise ValueError("Unbalanced parentheses in query")
+
+
+def _translate_hll(query):
+    while match := _HLL_RE.search(query):
+        inner_end = _closing_paren(query, match.end())
+        outer_end = _closing_paren(query, inner_end + 1)
+        expr = query[match.end():inner_end]
+        replacement = f"hll_export_hashes(LIST(HASH({expr})) FILTER (WHERE ({expr}) IS NOT NULL))"
+        query = query[:match.start()] + replacement + query[outer_end + 1:]
+    return query
+
+
+def translate(query):
+    """Rewrite a Snowflake query for DuckDB."""
+    query = _translate_hll(query)
+    query = _PATH_RE.sub(lambda m: f"json_extract_string({m.group(1)}, '{_json_path(m.group(2))}')", query)
+    query = _DATEDIFF_RE.sub(lambda m: f"date_diff('{m.group(1).lower()}',", query)
+    query = _EPOCH_RE.sub("epoch(", query)
+    return re.sub(r"::STRING\b", "::VARCHAR", query, flags=re.IGNORECASE)
+
+
+def _hll_export_hashes(hashes):
+    return hll.to_export(hll.from_hashes([h for h in hashes if h is not None]))
+
+
+def _integral_decimals_to_int(table):
+    # DuckDB sums integers into HUGEINT (decimal128(38, 0) in Arrow); Snowflake hands back int64
+    columns = [
+        column.cast(pa.int64()) if pa.types.is_decimal(column.type) and column.type.scale == 0 else column
+        for column in table.columns
+    ]
+    return pa.Table.from_arrays(columns, names=table.column_names)
+
+
+# --- Connection Adapters ------------------------------------------------------------------------------------------
+class _LocalCursor:
+    """The slice of the Snowflake cursor API that ``connection.fetch_frame`` uses."""
+
+    def __init__(self, conn):
+        self._conn = conn
+        self._result = None
+        self.sfqid = None
+
+    def execute(self, query, params=None):
+        self.sfqid = f"local-{uuid.uuid4()}"
+        self._result = self._conn.execute(translate(query), params or [])
+        return self
+
+    def fetch_arrow_all(self, force_return_table=False):
+        return _integral_decimals_to_int(self._result.fetch_arrow_table())
+
+    def close(self):
+        self._result = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class _LocalConnection:
+    def __init__(self, conn):
+        self._conn = conn
+
+    def cursor(self):
+        return _LocalCursor(self._conn)
+
+
+class LocalWarehouse:
+    """Drop-in for ``ConnectionPool``: ``connection()`` yields a Snowflake-like connection."""
+
+    def __init__(self, path):
+        import duckdb
+
+        self.path = Path(path)
+        self._db = duckdb.connect(str(self.path), read_only=True)
+        self._db.create_function(
+            "hll_export_hashes", _hll_export_hashes, [duckdb.list_type("UBIGINT")], "VARCHAR"
+        )
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def connection(self):
+        with self._lock:
+            conn = self._db.cursor()
+        try:
+            for macro in MACROS:
+                conn.execute(macro)
+            yield _LocalConnection(conn)
+        finally:
+            conn.close()
+
+    def close_all(self):
+        self._db.close()
+
+
+def local_db_path(backend):
+    """The DuckDB file from ``connection.backend_settings()`` (``AXELAR_LOCAL_DB`` or ``[backend] path``)."""
+    return Path(backend.get("path") or DEFAULT_PATH)
+
+
+def open_warehouse(backend):
+    """``LocalWarehouse`` over the configured file, generating synthetic data first if it doesn't exist."""
+    path = local_db_path(backend)
+    if not path.exists():
+        from shared import synthetic
+        synthetic.generate(path, rows=int(backend.get("rows", synthetic.DEFAULT_ROWS)))
+    return LocalWarehouse(path)
@@ -0,0 +1,132 @@
+"""Startup shared by every page: page config, sidebar footer, date inputs and warm-up.
+
+The first visit to a data page used to stall on importing the Snowflake
+connector (~0.45s here) and friends, which Home never needed. ``configure``
+now starts one background thread per process that imports them while the
+user is still on whatever page they opened first; each import's duration is
+logged so cold-start cost stays visible. The same thread then starts the
+pre-warm worker (see ``shared.prewarm``), so the data modules load off the
+script thread too. Home calls ``configure(data=False)`` and does nothing else
+on its script thread.
+"""
+import importlib
+import logging
+import threading
+import time
+
+import pandas as pd
+import streamlit as st
+
+from shared import profiler
+
+logger = logging.getLogger(__name__)
+
+PAGE_TITLE = "Axelar: An Overview"
+PAGE_ICON = "https://img.cryptorank.io/coins/axelar1663924228506.png"
+
+DEFAULT_START_DATE = "2024-01-01"
+DEFAULT_END_DATE = "2025-07-31"
+START_DATE_KEY = "start_date"
+END_DATE_KEY = "end_date"
+
+# imported in the background so the first data page doesn't wait for them
+WARM_MODULES = (
+    "snowflake.connector",
+    "cryptography.hazmat.primitives.serialization",
+    "plotly.express",
+    "plotly.graph_objects",
+)
+
+SIDEBAR_FOOTER = """
+<style>
+.sidebar-footer {
+    position: fixed;
+    bottom: 20px;
+    width: 250px;
+    font-size: 13px;
+    color: gray;
+    margin-left: 5px; # -- MOVE LEFT
+    text-align: left;
+}
+.sidebar-footer img {
+    width: 16px;
+    height: 16px;
+    vertical-align: middle;
+    border-radius: 50%;
+    margin-right: 5px;
+}
+.sidebar-footer a {
+    color: gray;
+    text-decoration: none;
+}
+</style>
+
+<div class="sidebar-footer">
+    <div>
+        <a href="https://x.com/axelar" target="_blank">
+            <img src="https://img.cryptorank.io/coins/axelar1663924228506.png" alt="Axelar Logo">
+            Powered by Axelar
+        </a>
+    </div>
+    <div style="margin-top: 5px;">
+        <a href="https://x.com/0xeman_raz" target="_blank">
+            <img src="https://pbs.twimg.com/profile_images/1841479747332608000/bindDGZQ_400x400.jpg" alt="Eman Raz">
+            Built by Eman Raz
+        </a>
+    </div>
+</div>
+"""
+
+
+# --- Warm-up ------------------------------------------------------------------------------------------------------
+def _import_all(modules):
+    for name in modules:
+        started = time.perf_counter()
+        try:
+            importlib.import_module(name)
+        except Exception as exc:
+            logger.warning("Warm-up could not import %s: %s", name, exc)
+            continue
+        logger.info("Warm-up imported %s in %.3fs", name, time.perf_counter() - started)
+
+
+def _warm(modules):
+    _import_all(modules)
+    # after plotly: the worker may open the local warehouse, and importing duckdb races plotly's check for it
+    from shared import prewarm
+    prewarm.start()
+
+
+@st.cache_resource
+def warm_up():
+    thread = threading.Thread(target=_warm, args=(WARM_MODULES,), name="warm-up", daemon=True)
+    thread.start()
+    return thread
+
+
+# --- Page Setup ---------------------------------------------------------------------------------------------------
+def configure(data=True):
+    """Page config and warm-up; ``data=False`` (Home) leaves the warehouse to the warm-up thread."""
+    st.set_page_config(page_title=PAGE_TITLE, page_icon=PAGE_ICON, layout="wide")
+    profiler.start_rerun()
+    warm_up()
+    if not data:
+        return
+    from shared import connection
+    if connection.backend_settings()["kind"] != "snowflake":
+        # open it here, not on a query thread: importing duckdb there races plotly's check for it
+        with profiler.span("open local warehouse", "connect"):
+            connection.get_backend()
+
+
+def sidebar_footer():
+    st.sidebar.markdown(SIDEBAR_FOOTER, unsafe_allow_html=True)
+
+
+def date_range():
+    start_date = st.date_input("Start Date", value=pd.to_datetime(DEFAULT_START_DATE), key=START_DATE_KEY)
+    end_date = st.date_input("End Date", value=pd.to_datetime(DEFAULT_END_DATE), key=END_DATE_KEY)
+    if end_date < start_date:
+        st.warning("End Date is before Start Date; showing the range between them.")
+        start_date, end_date = end_date, start_date
+    return start_date, end_date
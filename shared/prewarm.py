@@ -0,0 +1,154 @@
+"""Keep the result cache warm for the view almost every visitor lands on.
+
+On a cold load of the default window (``page.DEFAULT_START_DATE`` to
+``page.DEFAULT_END_DATE``) the pages issue a fixed set of warehouse queries:
+
+* Squid: the daily rollup and the per-chain user sketches;
+* Metrics: the hourly totals, the address sketches, the block summary, and
+  the time-series query once per granularity in ``timeframes.TIMEFRAMES``.
+
+``warm`` runs those same query texts with the same binds and TTLs through
+``connection.read_sql``, so they land in the on-disk result cache under the
+keys the pages look up. It only re-runs entries that are missing or that
+expire within ``margin`` seconds. The result cache is shared across
+restarts and replicas, so the first visitor after a deploy, or after an
+entry expires, reads from disk instead of the warehouse.
+
+``page.warm_up`` starts one worker thread per process. At startup, and then
+every ``interval`` seconds, it warms the result cache. It also loads the
+default window into the process's rollup stores (``warm_stores``), since
+rebuilding the Squid rollup from a cached result still costs seconds of
+pandas at scale. Disable it with ``AXELAR_PREWARM=0`` or ``[prewarm] enabled
+= false``; ``[prewarm] interval`` sets the period. The result-cache part can
+also run out of process, e.g. from cron before a deploy::
+
+    python -m shared.prewarm                 # one pass
+    python -m shared.prewarm --every 600     # keep running
+
+The exact chain-stats path is not warmed; it is off by default.
+"""
+import argparse
+import logging
+import threading
+import time
+
+from shared import chain_stats, squid
+from shared.connection import cached_until, read_sql
+from shared.disk_cache import get_result_cache, window_ttl
+from shared.page import DEFAULT_END_DATE, DEFAULT_START_DATE
+from shared.settings import settings
+from shared.timeframes import TIMEFRAMES
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = 600  # seconds between passes; entries expiring within two passes are refreshed
+
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def prewarm_settings():
+    prewarm = settings("prewarm", env_flag="AXELAR_PREWARM")
+    prewarm.setdefault("enabled", True)
+    prewarm["interval"] = int(prewarm.get("interval", DEFAULT_INTERVAL))
+    return prewarm
+
+
+def default_queries(start_date=DEFAULT_START_DATE, end_date=DEFAULT_END_DATE):
+    """``[(name, query, params, ttl), ...]`` the pages issue on a cold load of the window."""
+    queries = [
+        ("squid_rollup", *squid.build_rollup_query(start_date, end_date), window_ttl("squid_rollup", end_date)),
+        ("squid_users", *squid.build_users_query(start_date, end_date), window_ttl("squid_users", end_date)),
+        ("hourly_totals", *chain_stats.build_hourly_totals_query(start_date, end_date),
+         window_ttl("chain_stats", end_date)),
+        ("address_sketches", *chain_stats.build_address_sketch_query(start_date, end_date),
+         window_ttl("address_sketches", end_date)),
+        ("block_summary", *chain_stats.build_block_summary_query(start_date, end_date),
+         window_ttl("block_summary", end_date)),
+    ]
+    for timeframe in TIMEFRAMES:
+        queries.append((f"txn_metrics:{timeframe}", *chain_stats.build_txn_metrics_query(timeframe, start_date, end_date),
+                        window_ttl("txn_metrics", end_date)))
+    return queries
+
+
+def warm(queries=None, margin=2 * DEFAULT_INTERVAL):
+    """Run every query whose cached result is missing or expires within ``margin`` seconds.
+
+    Returns ``[(name, status, seconds), ...]`` with status ``fresh``, ``loaded``,
+    ``refreshed`` or ``failed``.
+    """
+    if get_result_cache() is None:
+        logger.warning("Result cache is disabled; nothing to pre-warm")
+        return []
+    report = []
+    for name, query, params, ttl in queries or default_queries():
+        started = time.perf_counter()
+        expires_at = cached_until(query, params)
+        if expires_at is not None and expires_at - time.time() > margin:
+            report.append((name, "fresh", 0.0))
+            continue
+        try:
+            read_sql(query, params, ttl=ttl, refresh=expires_at is not None)
+        except Exception as exc:
+            logger.warning("Pre-warm of %s failed: %s", name, exc)
+            report.append((name, "failed", time.perf_counter() - started))
+            continue
+        status = "loaded" if expires_at is None else "refreshed"
+        report.append((name, status, time.perf_counter() - started))
+        logger.info("Pre-warm %s %s in %.2fs", status, name, time.perf_counter() - started)
+    return report
+
+
+def warm_stores(start_date=DEFAULT_START_DATE, end_date=DEFAULT_END_DATE):
+    """Load the window into this process's rollup stores, reading through the result cache."""
+    stores = (squid.get_rollup_store(), squid.get_users_store(),
+              chain_stats.get_address_sketch_store(), chain_stats.get_block_summary_store())
+    for store in stores:
+        started = time.perf_counter()
+        store.window(start_date, end_date)
+        logger.info("Pre-warm loaded the %s store in %.2fs", store.name, time.perf_counter() - started)
+
+
+def run_forever(interval=DEFAULT_INTERVAL):
+    while True:
+        try:
+            warm(margin=2 * interval)
+            warm_stores()
+        except Exception:
+            logger.exception("Pre-warm pass failed")
+        time.sleep(interval)
+
+
+def start():
+    """Start this process's pre-warm worker once (no-op when disabled or already running)."""
+    global _worker
+    prewarm = prewarm_settings()
+    if not prewarm["enabled"]:
+        return None
+    with _worker_lock:
+        if _worker is None:
+            _worker = threading.Thread(target=run_forever, args=(prewarm["interval"],), name="prewarm", daemon=True)
+            _worker.start()
+    return _worker
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--start", default=DEFAULT_START_DATE)
+    parser.add_argument("--end", default=DEFAULT_END_DATE)
+    parser.add_argument("--every", type=int, default=None, help="repeat every N seconds instead of running once")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    margin = 2 * (args.every or DEFAULT_INTERVAL)
+    while True:
+        for name, status, seconds in warm(default_queries(args.start, args.end), margin=margin):
+            print(f"{name:24} {status:9} {seconds:6.2f}s")
+        if args.every is None:
+            return
+        time.sleep(args.every)
+
+
+if __name__ == "__main__":
+    main()
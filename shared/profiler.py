@@ -0,0 +1,197 @@
+"""Per-rerun timeline of where a page's time goes, for debugging slow loads.
+
+Phases and loaders are wrapped in ``span(name, category)``. Cache lookups note
+``cache="hit"``/``"miss"`` and warehouse queries note their query ID and row
+count on the innermost open span (``annotate``). Spans are recorded on the
+session's current ``Trace``, from any thread that carries the session's
+script-run context, which includes the query pools (see ``shared.scheduler``).
+``page.configure`` starts a new trace on every full rerun. A fragment rerun
+adds to the trace of the run before it.
+
+Recording is off unless ``AXELAR_PROFILE=1`` is set, or ``[profiler] enabled
+= true`` in secrets. While it is off, ``span`` and ``annotate`` do nothing.
+When it is on, ``timeline()`` draws a collapsible panel in the sidebar with
+the rerun as a Gantt chart, a span table, the process's cache counters
+(``cache_policy.cache_stats``) and a Chrome-trace JSON download (open it in
+``chrome://tracing`` or https://ui.perfetto.dev).
+"""
+import functools
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from shared.settings import settings
+
+_TRACE_KEY = "_profiler_trace"
+
+CATEGORY_COLORS = {
+    "phase": "#3f48cc",
+    "loader": "#b701ba",
+    "cache": "#8dffad",
+    "query": "#ff9750",
+    "connect": "#f77f84",
+    "pandas": "#99dfff",
+    "render": "#ece000",
+    "wait": "#cccccc",
+}
+
+_local = threading.local()
+
+
+@functools.lru_cache(maxsize=None)
+def enabled():
+    return bool(settings("profiler", env_flag="AXELAR_PROFILE").get("enabled", False))
+
+
+class Trace:
+    """Spans of one rerun, as offsets in seconds from its start."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.started_at = time.time()
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def add(self, name, category, start, end, args):
+        thread = threading.current_thread()
+        with self._lock:
+            self.spans.append({
+                "name": name,
+                "category": category,
+                "thread": thread.name,
+                "thread_id": thread.ident,
+                "start": start - self.started,
+                "duration": end - start,
+                "args": args,
+            })
+
+    def to_frame(self):
+        with self._lock:
+            spans = list(self.spans)
+        df = pd.DataFrame(spans, columns=["name", "category", "thread", "thread_id", "start", "duration", "args"])
+        df["start_ms"] = (df["start"] * 1000).round(1)
+        df["duration_ms"] = (df["duration"] * 1000).round(1)
+        df["details"] = df["args"].map(lambda args: ", ".join(f"{k}={v}" for k, v in args.items()))
+        return df.sort_values("start", ignore_index=True)
+
+    def to_chrome(self):
+        """The trace in Chrome's Trace Event Format (complete ``X`` events, times in microseconds)."""
+        with self._lock:
+            spans = list(self.spans)
+        origin = self.started_at * 1e6
+        events = [
+            {"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": name}}
+            for tid, name in sorted({(s["thread_id"], s["thread"]) for s in spans})
+        ]
+        events += [
+            {
+                "name": s["name"], "cat": s["category"], "ph": "X", "pid": 1, "tid": s["thread_id"],
+                "ts": origin + s["start"] * 1e6, "dur": s["duration"] * 1e6,
+                "args": {k: str(v) for k, v in s["args"].items()},
+            }
+            for s in spans
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def start_rerun():
+    """Begin a new trace for the current session (no-op while profiling is off)."""
+    if enabled() and get_script_run_ctx(suppress_warning=True) is not None:
+        st.session_state[_TRACE_KEY] = Trace()
+
+
+def current_trace():
+    if not enabled() or get_script_run_ctx(suppress_warning=True) is None:
+        return None
+    return st.session_state.get(_TRACE_KEY)
+
+
+def _open_spans():
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+
+@contextmanager
+def span(name, category="phase", **args):
+    """Time the enclosed block as ``name`` on the current trace."""
+    trace = current_trace()
+    if trace is None:
+        yield
+        return
+    stack = _open_spans()
+    stack.append(args)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        stack.pop()
+        trace.add(name, category, started, time.perf_counter(), args)
+
+
+def annotate(**args):
+    """Attach ``args`` to the innermost open span on this thread."""
+    stack = getattr(_local, "stack", None)
+    if stack:
+        stack[-1].update(args)
+
+
+def timed(category, name=None):
+    """Decorator form of ``span``, named after the function by default."""
+    def decorator(fn):
+        label = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(label, category):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# --- Debug Panel --------------------------------------------------------------------------------------------------
+def _timeline_figure(df):
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+    for category, spans in df.groupby("category", sort=False):
+        fig.add_bar(
+            x=spans["duration_ms"], base=spans["start_ms"], y=spans["name"], orientation="h", name=category,
+            marker_color=CATEGORY_COLORS.get(category), customdata=spans[["thread", "details"]],
+            hovertemplate="%{y}<br>%{base:.0f}-%{x:.0f} ms<br>%{customdata[0]}<br>%{customdata[1]}<extra></extra>",
+        )
+    fig.update_layout(
+        barmode="overlay", height=max(250, 18 * df["name"].nunique() + 80), margin=dict(l=0, r=0, t=10, b=0),
+        xaxis_title="ms since rerun start", legend=dict(orientation="h", y=-0.15),
+    )
+    fig.update_yaxes(autorange="reversed", categoryorder="array", categoryarray=df["name"].unique())
+    return fig
+
+
+def timeline():
+    """Sidebar panel for the current rerun; call it last on the page."""
+    from shared.cache_policy import cache_stats
+
+    trace = current_trace()
+    if trace is None:
+        return
+    df = trace.to_frame()
+    with st.sidebar.expander(f"⏱️ Rerun profile ({(time.perf_counter() - trace.started) * 1000:,.0f} ms)"):
+        if df.empty:
+            st.caption("No spans recorded.")
+            return
+        st.plotly_chart(_timeline_figure(df), width="stretch")
+        cache = df["args"].map(lambda args: args.get("cache")).value_counts()
+        st.caption(f"Cache hits: {cache.get('hit', 0)}, misses: {cache.get('miss', 0)}")
+        st.dataframe(df[["name", "category", "thread", "start_ms", "duration_ms", "details"]], hide_index=True)
+        st.caption("Caches (this process, since start)")
+        st.dataframe(cache_stats(), hide_index=True)
+        st.download_button(
+            "Download Chrome trace", json.dumps(trace.to_chrome()),
+            file_name=f"axelar-trace-{int(trace.started_at)}.json", mime="application/json",
+        )
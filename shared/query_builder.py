@@ -0,0 +1,103 @@
+"""Registry of precompiled, parameterized warehouse queries.
+
+Templates are plain SQL with ``{field}`` placeholders:
+
+* ``{start}`` / ``{end_exclusive}`` become ``?`` bind variables (the pool
+  connects with ``paramstyle="qmark"``), so every date window shares one SQL
+  text and Snowflake can reuse its compiled plan and 24h result cache;
+* any other field is a whitelisted literal (``{timeframe}`` must be one of
+  ``timeframes.TIMEFRAMES``) that is validated and inlined when the template is
+  compiled. Compiled text is kept per literal combination.
+
+Filtering on ``created_at::date >= ...`` (or any cast of the timestamp) hides
+the raw column from micro-partition pruning, and a filter on the outer
+``SELECT`` of a ``UNION ALL`` is applied only after both branches have scanned
+and parsed their VARIANT columns. Templates therefore filter the raw
+timestamp inside every branch as a half-open range::
+
+    created_at >= {start} AND created_at < {end_exclusive}
+
+and every compiled query is checked with ``check_prunable``.
+"""
+import re
+import threading
+
+import pandas as pd
+
+from shared.timeframes import TIMEFRAMES
+
+BIND_FIELDS = ("start", "end_exclusive")
+
+LITERAL_VALIDATORS = {
+    "timeframe": lambda value: value in TIMEFRAMES,
+    "squid_contracts": lambda value: re.fullmatch(r"'0x[0-9a-f]{40}'(, '0x[0-9a-f]{40}')*", value) is not None,
+}
+
+TEMPLATES = {}
+_registry_lock = threading.Lock()
+
+_FIELD_RE = re.compile(r"\{(\w+)\}")
+_FACT_TABLE_RE = re.compile(r"\bFROM\s+axelar\.\w+\.\w+", re.IGNORECASE)
+_CAST_FILTER_RE = re.compile(r"\w+\s*::\s*date\s*(?:>=|<=|<|>|=)", re.IGNORECASE)
+_RANGE_RE = re.compile(r"\b(\w+)\s*>=\s*(?:'[^']+'|\?)\s+AND\s+\1\s*<\s*(?:'[^']+'|\?)", re.IGNORECASE)
+
+
+def date_bounds(start_date, end_date):
+    """Inclusive day window -> ``(start, end_exclusive)`` strings."""
+    start = pd.to_datetime(start_date).normalize()
+    end_exclusive = pd.to_datetime(end_date).normalize() + pd.Timedelta(days=1)
+    return start.strftime("%Y-%m-%d"), end_exclusive.strftime("%Y-%m-%d")
+
+
+def check_prunable(query):
+    """Raise ``ValueError`` unless every fact-table scan has a raw range filter."""
+    cast = _CAST_FILTER_RE.search(query)
+    if cast:
+        raise ValueError(f"Date filter on a cast column prevents pruning: {cast.group(0)!r}")
+    scans = len(_FACT_TABLE_RE.findall(query))
+    ranges = len(_RANGE_RE.findall(query))
+    if ranges < scans:
+        raise ValueError(f"Query scans {scans} fact tables but only has {ranges} range filters")
+    return query
+
+
+class QueryTemplate:
+    def __init__(self, name, sql):
+        self.name = name
+        self.sql = sql
+        self.fields = _FIELD_RE.findall(sql)
+        self._compiled = {}
+
+    def _literal(self, field, literals):
+        if field not in literals:
+            raise KeyError(f"Template {self.name!r} needs a value for {{{field}}}")
+        value = literals[field]
+        validator = LITERAL_VALIDATORS.get(field)
+        if validator is None or not validator(value):
+            raise ValueError(f"Rejected literal {field}={value!r} for template {self.name!r}")
+        return value
+
+    def compile(self, **literals):
+        key = tuple(sorted(literals.items()))
+        if key not in self._compiled:
+            text = _FIELD_RE.sub(
+                lambda m: "?" if m.group(1) in BIND_FIELDS else self._literal(m.group(1), literals),
+                self.sql,
+            )
+            self._compiled[key] = check_prunable(text)
+        return self._compiled[key]
+
+    def render(self, start_date, end_date, **literals):
+        """Return ``(sql, params)`` for an inclusive day window."""
+        bounds = dict(zip(BIND_FIELDS, date_bounds(start_date, end_date)))
+        params = [bounds[field] for field in self.fields if field in BIND_FIELDS]
+        return self.compile(**literals), params
+
+
+def template(name, sql):
+    """Get or register the template ``name`` (re-registering with new SQL replaces it)."""
+    with _registry_lock:
+        existing = TEMPLATES.get(name)
+        if existing is None or existing.sql != sql:
+            TEMPLATES[name] = QueryTemplate(name, sql)
+        return TEMPLATES[name]
@@ -0,0 +1,66 @@
+"""Cache for time-bucketed loaders that reuses overlapping date windows.
+
+Results are stored per period span (see ``shared.timeframes.split_periods``),
+so a new ``[start_date, end_date]`` only queries the spans that have not been
+seen before, in as few contiguous sub-ranges as possible, and stitches them
+together with the cached ones. Spans are kept in a named ``LRUCache`` (see
+``shared.cache_policy``); spans that reach today can still change and are only
+kept for the policy's ``open_ttl``.
+"""
+import pandas as pd
+
+from shared import profiler
+from shared.cache_policy import LRUCache, get_policy
+from shared.scheduler import run_concurrently
+from shared.timeframes import period_start, split_periods, today, truncate_dates
+
+
+def _contiguous(spans):
+    runs = []
+    for lo, hi in spans:
+        if runs and lo == runs[-1][1] + pd.Timedelta(days=1):
+            runs[-1] = (runs[-1][0], hi)
+        else:
+            runs.append((lo, hi))
+    return runs
+
+
+class RangeCache:
+    def __init__(self, name, fetch, date_column="Date", finalize=None):
+        # fetch(timeframe, start_date, end_date) -> DataFrame with one row per period
+        self._fetch = fetch
+        self._date_column = date_column
+        self._finalize = finalize
+        self._spans = LRUCache.for_policy(name)
+        self._open_ttl = get_policy(name)["open_ttl"]
+
+    def _split(self, timeframe, df, spans):
+        periods = truncate_dates(pd.to_datetime(df[self._date_column]), timeframe)
+        return {span: df[periods == period_start(span[0], timeframe)] for span in spans}
+
+    def get(self, timeframe, start_date, end_date):
+        with profiler.span(f"{self._spans.name} {timeframe}", "cache"):
+            return self._get(timeframe, start_date, end_date)
+
+    def _get(self, timeframe, start_date, end_date):
+        spans = split_periods(timeframe, start_date, end_date)
+        if not spans:
+            # an inverted window has no periods; the first day's result gives the columns to return empty
+            return self._get(timeframe, start_date, start_date).iloc[:0]
+        found = {span: self._spans.get((timeframe,) + span) for span in spans}
+        missing = _contiguous([span for span, df in found.items() if df is None])
+        cached_spans = sum(df is not None for df in found.values())
+        profiler.annotate(cache="hit" if not missing else "miss", cached_periods=f"{cached_spans}/{len(spans)}")
+        fetched = run_concurrently([(self._fetch, (timeframe, lo, hi)) for lo, hi in missing])
+
+        closed_before = today() - pd.Timedelta(days=1)
+        for (lo, hi), df in zip(missing, fetched):
+            run_spans = split_periods(timeframe, lo, hi)
+            for span, part in self._split(timeframe, df, run_spans).items():
+                found[span] = part
+                ttl = None if span[1] <= closed_before else self._open_ttl
+                self._spans.set((timeframe,) + span, part, ttl=ttl)
+
+        parts = [found[span] for span in spans if not found[span].empty]
+        df = pd.concat(parts, ignore_index=True) if parts else next(iter(found.values()))
+        return self._finalize(df) if self._finalize else df
@@ -0,0 +1,147 @@
+"""Append-only store of per-day rollups.
+
+The store keeps every day it has seen and remembers the covered span
+``[first_day, watermark]``. Asking for a window only fetches the days outside
+that span (plus the watermark day itself, at most every ``open_ttl`` seconds,
+while it can still receive rows), so moving the date pickers or switching
+timeframe never re-scans history. Past the policy's ``max_bytes`` the oldest
+days outside the requested window are dropped.
+
+The lock only guards the store's state, never a fetch: each missing range is
+claimed with a ``Future``, fetched inline by the caller that claimed it and
+awaited by anyone else who needs it. A store shared by the page and by
+prefetches on the query pool therefore never waits on the pool while holding
+its lock.
+"""
+import threading
+import time
+from concurrent.futures import Future
+
+import pandas as pd
+
+from shared import profiler
+from shared.cache_policy import CACHES, get_policy, sizeof
+from shared.timeframes import today
+
+ONE_DAY = pd.Timedelta(days=1)
+
+
+class RollupStore:
+    def __init__(self, name, fetch, day_column="day"):
+        # fetch(start, end) -> DataFrame of rollup rows for the inclusive day range
+        self.name = name
+        self._fetch = fetch
+        self._day_column = day_column
+        self._policy = get_policy(name)
+        self._lock = threading.Lock()
+        self._inflight = {}  # (start, end) -> Future of the fetch in progress
+        self._refreshed_at = None
+        self.rollup = None
+        self.first_day = None
+        self.watermark = None
+        self.hits = self.misses = self.evictions = 0
+        CACHES[name] = self
+
+    def _missing_ranges(self, start, end):
+        if self.watermark is None:
+            return [(start, end)]
+        ranges = []
+        if start < self.first_day:
+            ranges.append((start, self.first_day - ONE_DAY))
+        refresh_from = self.watermark + ONE_DAY
+        watermark_open = self.watermark >= today() - ONE_DAY
+        if watermark_open and time.monotonic() - self._refreshed_at > self._policy["open_ttl"]:
+            refresh_from = self.watermark
+        if end >= refresh_from:
+            ranges.append((refresh_from, end))
+        return ranges
+
+    def _append(self, start, end, rows):
+        rows = rows.copy()
+        rows[self._day_column] = pd.to_datetime(rows[self._day_column])
+        if self.rollup is None:
+            self.rollup = rows
+        else:
+            days = self.rollup[self._day_column]
+            keep = self.rollup[(days < start) | (days > end)]
+            self.rollup = pd.concat([keep, rows], ignore_index=True)
+        self.first_day = start if self.first_day is None else min(self.first_day, start)
+        if self.watermark is None or end >= self.watermark:
+            self.watermark = end
+            self._refreshed_at = time.monotonic()
+
+    def _trim(self, start):
+        nbytes = sizeof(self.rollup)
+        if nbytes <= self._policy["max_bytes"]:
+            return
+        ndays = (self.watermark - self.first_day).days + 1
+        keep_days = max(1, int(ndays * self._policy["max_bytes"] / nbytes))
+        first_day = min(start, self.watermark - (keep_days - 1) * ONE_DAY)
+        if first_day <= self.first_day:
+            return
+        self.rollup = self.rollup[self.rollup[self._day_column] >= first_day]
+        self.evictions += (first_day - self.first_day).days
+        self.first_day = first_day
+
+    def refresh(self, start, end):
+        start, end = pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize()
+        with profiler.span(self.name, "cache"):
+            with self._lock:
+                ranges = self._missing_ranges(start, end)
+                if ranges:
+                    self.misses += 1
+                else:
+                    self.hits += 1
+                claimed = [r for r in ranges if r not in self._inflight]
+                for r in claimed:
+                    self._inflight[r] = Future()
+                waiting = [self._inflight[r] for r in ranges if r not in claimed]
+            profiler.annotate(cache="miss" if ranges else "hit", fetched_ranges=len(claimed))
+            for i, r in enumerate(claimed):
+                try:
+                    self._fetch_range(r)
+                except BaseException as exc:
+                    for rest in claimed[i + 1:]:
+                        self._release(rest, exc)
+                    raise
+            for future in waiting:
+                future.result()
+            with self._lock:
+                self._trim(start)
+                return self.rollup
+
+    def _fetch_range(self, fetch_range):
+        try:
+            rows = self._fetch(*fetch_range)
+            with self._lock:
+                self._append(*fetch_range, rows)
+        except BaseException as exc:
+            self._release(fetch_range, exc)
+            raise
+        self._release(fetch_range)
+
+    def _release(self, fetch_range, exc=None):
+        """Resolve a claimed range's future so callers waiting on it wake up."""
+        with self._lock:
+            future = self._inflight.pop(fetch_range)
+        if exc is None:
+            future.set_result(None)
+        else:
+            future.set_exception(exc)
+
+    def window(self, start, end):
+        rollup = self.refresh(start, end)
+        start, end = pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize()
+        days = rollup[self._day_column]
+        return rollup[(days >= start) & (days <= end)]
+
+    def stats(self):
+        return {
+            "cache": self.name,
+            "entries": 0 if self.rollup is None else len(self.rollup),
+            "bytes": 0 if self.rollup is None else sizeof(self.rollup),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": 0,
+        }
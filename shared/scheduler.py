@@ -0,0 +1,104 @@
+"""Run a page's independent queries concurrently and render rows as they land.
+
+Loaders are submitted up front to a process-wide thread pool; the page then
+reserves a container per row and fills each one as soon as its own result
+arrives, so page load costs the slowest query instead of the sum of them.
+
+Work submitted from inside a pool task (a loader that itself fans out) goes
+to a second pool, and anything nested deeper runs inline, so a task never
+waits on work queued behind it in its own pool.
+
+Tasks run under the submitting session's ``ScriptRunContext``, attached with
+Streamlit's public ``add_script_run_ctx``. That API cannot detach a context,
+so work submitted without one (the pre-warm worker, tests) gets its own pair
+of pools whose threads never carry a session.
+"""
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+from shared import profiler
+
+DEFAULT_MAX_WORKERS = 8
+
+_executor = ThreadPoolExecutor(max_workers=DEFAULT_MAX_WORKERS, thread_name_prefix="query")
+_nested_executor = ThreadPoolExecutor(max_workers=DEFAULT_MAX_WORKERS, thread_name_prefix="query-nested")
+# for work submitted outside a session; threads are only started once something is submitted
+_background_executor = ThreadPoolExecutor(max_workers=DEFAULT_MAX_WORKERS, thread_name_prefix="background")
+_background_nested_executor = ThreadPoolExecutor(
+    max_workers=DEFAULT_MAX_WORKERS, thread_name_prefix="background-nested"
+)
+_local = threading.local()
+
+
+class _InlineExecutor:
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as exc:
+            future.set_exception(exc)
+        return future
+
+
+def _current_depth():
+    return getattr(_local, "depth", 0)
+
+
+def _default_executor(ctx):
+    pools = (_executor, _nested_executor) if ctx is not None else (_background_executor, _background_nested_executor)
+    return (*pools, _InlineExecutor())[min(_current_depth(), 2)]
+
+
+def _with_ctx(ctx, fn, depth, label):
+    # st.cache_data and friends look up the session on the calling thread. A session pool thread keeps
+    # its last task's context until the next task replaces it; context-free work never runs there.
+    def run(*args, **kwargs):
+        if ctx is not None and get_script_run_ctx(suppress_warning=True) is not ctx:
+            add_script_run_ctx(ctx=ctx)
+        previous, _local.depth = _current_depth(), depth
+        try:
+            with profiler.span(label, "loader"):
+                return fn(*args, **kwargs)
+        finally:
+            _local.depth = previous
+    return run
+
+
+class QueryScheduler:
+    def __init__(self, executor=None):
+        self._ctx = get_script_run_ctx(suppress_warning=True)
+        self._executor = executor or _default_executor(self._ctx)
+        self._depth = _current_depth() + 1
+        self._futures = {}
+
+    def submit(self, name, fn, *args, **kwargs):
+        # run_concurrently numbers its calls, so those are labelled after the function instead
+        label = name if isinstance(name, str) else getattr(fn, "__qualname__", repr(fn))
+        self._futures[name] = self._executor.submit(_with_ctx(self._ctx, fn, self._depth, label), *args, **kwargs)
+        return self._futures[name]
+
+    def result(self, name):
+        return self._futures[name].result()
+
+    def as_completed(self, names=None):
+        names = list(self._futures) if names is None else names
+        by_future = {self._futures[name]: name for name in names}
+        for future in as_completed(by_future):
+            yield by_future[future], future.result()
+
+    def render(self, renderers):
+        """``renderers`` maps a submitted name to ``(container, render_fn)``."""
+        for name, result in self.as_completed(list(renderers)):
+            container, render_fn = renderers[name]
+            with container, profiler.span(f"render {name}", "render"):
+                render_fn(result)
+
+
+def run_concurrently(calls, executor=None):
+    """Run ``[(fn, args), ...]`` on the pool and return results in order."""
+    scheduler = QueryScheduler(executor)
+    for i, (fn, args) in enumerate(calls):
+        scheduler.submit(i, fn, *args)
+    return [scheduler.result(i) for i in range(len(calls))]
@@ -0,0 +1,34 @@
+"""Feature settings: one ``st.secrets`` section each, with environment overrides.
+
+Every feature reads its own section (``[backend]``, ``[disk_cache]``,
+``[prewarm]``, ``[profiler]``, ``[cache.<name>]``) and lets an ``AXELAR_*``
+variable override it, so the local backend, the benchmark and cron jobs can
+be configured without a secrets file. Running without one is normal there and
+reads as empty sections.
+"""
+import os
+
+import streamlit as st
+
+FALSE_VALUES = ("", "0", "false", "no")
+
+
+def settings(section, env_flag=None, **env):
+    """``[section]`` of the secrets as a plain dict, with environment overrides.
+
+    ``env_flag`` names a variable that, when set, overrides ``enabled``
+    (anything but ``""``, ``0``, ``false`` or ``no`` turns it on). Each
+    ``key="VARIABLE"`` in ``env`` overrides ``key`` when the variable is set
+    and not empty.
+    """
+    try:
+        values = dict(st.secrets.get(section, {}))
+    except FileNotFoundError:
+        values = {}
+    flag = os.environ.get(env_flag) if env_flag else None
+    if flag is not None:
+        values["enabled"] = flag.lower() not in FALSE_VALUES
+    for key, variable in env.items():
+        if os.environ.get(variable):
+            values[key] = os.environ[variable]
+    return values
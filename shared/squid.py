@@ -0,0 +1,351 @@
+"""Squid activity queries and the local aggregations built on top of them.
+
+All Squid charts are computed in pandas from two per-day stores of the
+Squid activity (see ``shared.rollup``), so the warehouse is only scanned for
+days that have not been loaded yet:
+
+* the rollup: transfers, volume and fees per day x source chain x
+  destination chain x raw asset x service;
+* the users: an HLL sketch of the senders per day x source chain and per
+  day x destination chain, which is all the unique-user figures need. Keeping
+  sketches at the rollup's grain made the warehouse build hundreds of
+  thousands of them and every union loop over as many Python objects.
+"""
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+
+from shared import hll, profiler, query_builder, staging
+from shared.connection import read_sql
+from shared.disk_cache import window_ttl
+from shared.rollup import RollupStore
+from shared.scheduler import run_concurrently
+from shared.timeframes import truncate_dates
+
+# --- Activity Query -----------------------------------------------------------------------------------------------
+SQUID_TRANSFERS = staging.Stage(
+    "squid_transfers", staging.FACT_TRANSFERS,
+    columns=["created_at", "id", "recipient_address"],
+    fields=staging.TRANSFER_FIELDS,
+    where=[
+        "status = 'executed'",
+        "simplified_status = 'received'",
+        "created_at >= {start}",
+        "created_at < {end_exclusive}",
+        "LOWER(sender_address) IN ({squid_contracts})",
+    ],
+)
+
+SQUID_GMP = staging.Stage(
+    "squid_gmp", staging.FACT_GMP,
+    columns=["created_at", "id"],
+    fields=staging.GMP_FIELDS,
+    where=[
+        "status = 'executed'",
+        "simplified_status = 'received'",
+        "created_at >= {start}",
+        "created_at < {end_exclusive}",
+        "LOWER(data:approved:returnValues:contractAddress::STRING) IN ({squid_contracts})",
+    ],
+)
+
+SQUID_ACTIVITY_QUERY = """
+WITH {staging},
+axelar_service AS (
+    -- Token Transfers
+    SELECT 
+        created_at, 
+        LOWER(source_chain) AS source_chain, 
+        LOWER(destination_chain) AS destination_chain,
+        recipient_address AS user, 
+        amount * price AS amount_usd,
+        fee_value AS fee,
+        id, 
+        'Token Transfers' AS service, 
+        asset AS raw_asset
+    FROM squid_transfers
+
+    UNION ALL
+
+    -- GMP
+    SELECT  
+        created_at,
+        source_chain,
+        destination_chain,
+        sender AS user,
+        value AS amount_usd,
+        COALESCE(gas_used_amount * token_price_usd, express_fee_usd) AS fee,
+        id, 
+        'GMP' AS service, 
+        symbol AS raw_asset
+    FROM squid_gmp
+)
+SELECT 
+    created_at,
+    source_chain,
+    destination_chain,
+    user,
+    amount_usd,
+    fee,
+    id,
+    service,
+    raw_asset
+FROM axelar_service
+""".replace("{staging}", staging.ctes(SQUID_TRANSFERS, SQUID_GMP))
+
+SQUID_ROLLUP_QUERY = """
+SELECT 
+    created_at::date AS day,
+    source_chain,
+    destination_chain,
+    raw_asset,
+    service,
+    COUNT(DISTINCT id) AS transfers,
+    SUM(amount_usd) AS volume_usd,
+    SUM(fee) AS fee
+FROM ({activity}) activity
+GROUP BY 1, 2, 3, 4, 5
+"""
+
+# one scan, two groupings: chain_column says which chain ``chain`` is
+SQUID_USERS_QUERY = """
+SELECT
+    created_at::date AS day,
+    IFF(GROUPING(destination_chain) = 1, 'source_chain', 'destination_chain') AS chain_column,
+    IFF(GROUPING(destination_chain) = 1, source_chain, destination_chain) AS chain,
+    HLL_EXPORT(HLL_ACCUMULATE(user)) AS users
+FROM ({activity}) activity
+GROUP BY GROUPING SETS ((created_at::date, source_chain), (created_at::date, destination_chain))
+"""
+
+CONTRACTS_FILE = Path(__file__).parent / "data" / "squid_contracts.csv"
+SYMBOLS_FILE = Path(__file__).parent / "data" / "asset_symbols.csv"
+
+ROLLUP_KEYS = ["day", "source_chain", "destination_chain", "raw_asset", "service"]
+
+OTHER_SYMBOL = "Other"
+OTHER_CHAIN = "Other"
+TOP_N_METRICS = ["Volume of Transfers (USD)", "Number of Transfers", "Number of Users"]
+SHARE_COLUMNS = {"Number of Transfers": "Number of Swaps %", "Volume of Transfers (USD)": "Volume %"}
+
+def load_contracts(path=CONTRACTS_FILE):
+    """Squid router/contract addresses (lowercased) -> label."""
+    contracts = pd.read_csv(path, dtype=str)
+    addresses = contracts["address"].str.strip().str.lower()
+    invalid = addresses[~addresses.str.fullmatch(r"0x[0-9a-f]{40}")]
+    if not invalid.empty:
+        raise ValueError(f"Invalid contract address in {path}: {invalid.iloc[0]!r}")
+    return dict(zip(addresses, contracts["label"]))
+
+
+SQUID_CONTRACTS = load_contracts()
+
+
+# --- Asset Symbols ------------------------------------------------------------------------------------------------
+def load_symbols(path=SYMBOLS_FILE):
+    """Raw asset id -> display symbol, plus ``(prefix, symbol)`` rules for ids ending in ``*``."""
+    symbols = pd.read_csv(path, dtype=str, keep_default_na=False)
+    is_prefix = symbols["raw_asset"].str.endswith("*")
+    exact = dict(zip(symbols.loc[~is_prefix, "raw_asset"], symbols.loc[~is_prefix, "symbol"]))
+    prefixes = [
+        (raw_asset[:-1].lower(), symbol)
+        for raw_asset, symbol in zip(symbols.loc[is_prefix, "raw_asset"], symbols.loc[is_prefix, "symbol"])
+    ]
+    return exact, prefixes
+
+
+ASSET_SYMBOLS, ASSET_SYMBOL_PREFIXES = load_symbols()
+
+
+def _symbol_for(raw_asset):
+    if raw_asset in ASSET_SYMBOLS:
+        return ASSET_SYMBOLS[raw_asset]
+    lowered = raw_asset.lower()
+    for prefix, symbol in ASSET_SYMBOL_PREFIXES:
+        if lowered.startswith(prefix):
+            return symbol
+    return raw_asset
+
+
+def to_symbols(raw_assets):
+    """Display symbol per row; the lookup runs once per distinct raw asset."""
+    mapping = {raw_asset: _symbol_for(raw_asset) for raw_asset in raw_assets.dropna().unique()}
+    return raw_assets.map(mapping)
+
+
+ACTIVITY_TEMPLATE = query_builder.template("squid_activity", SQUID_ACTIVITY_QUERY)
+ROLLUP_TEMPLATE = query_builder.template(
+    "squid_rollup", SQUID_ROLLUP_QUERY.replace("{activity}", SQUID_ACTIVITY_QUERY)
+)
+USERS_TEMPLATE = query_builder.template(
+    "squid_users", SQUID_USERS_QUERY.replace("{activity}", SQUID_ACTIVITY_QUERY)
+)
+
+
+def _contracts_literal():
+    return ", ".join(f"'{address}'" for address in SQUID_CONTRACTS)
+
+
+def build_activity_query(start_date, end_date):
+    return ACTIVITY_TEMPLATE.render(start_date, end_date, squid_contracts=_contracts_literal())
+
+
+def build_rollup_query(start_date, end_date):
+    return ROLLUP_TEMPLATE.render(start_date, end_date, squid_contracts=_contracts_literal())
+
+
+def build_users_query(start_date, end_date):
+    return USERS_TEMPLATE.render(start_date, end_date, squid_contracts=_contracts_literal())
+
+
+@profiler.timed("pandas")
+def normalize_rollup(df):
+    """One row per day x source chain x destination chain x raw asset x service.
+
+    The warehouse groups on the raw asset id; ``symbol`` is attached here from
+    ``asset_symbols.csv``, so the mapping can grow without touching the query.
+    """
+    df = df.rename(columns=str.lower)
+    df["day"] = pd.to_datetime(df["day"])
+    df["symbol"] = to_symbols(df["raw_asset"])
+    return df[ROLLUP_KEYS + ["symbol", "transfers", "volume_usd", "fee"]]
+
+
+@profiler.timed("pandas")
+def normalize_users(df):
+    """One row per day x ``chain_column`` x chain; ``users`` is an HLL sketch of its senders (see ``shared.hll``).
+
+    Each activity row falls in exactly one source chain and one destination
+    chain, so the union of either side's sketches over a day counts that
+    day's users.
+    """
+    df = df.rename(columns=str.lower)
+    df["day"] = pd.to_datetime(df["day"])
+    df["users"] = df["users"].map(hll.from_export)
+    return df[["day", "chain_column", "chain", "users"]]
+
+
+# --- Daily Rollup Store -------------------------------------------------------------------------------------------
+def fetch_rollup(start_date, end_date):
+    query, params = build_rollup_query(start_date, end_date)
+    return normalize_rollup(read_sql(query, params, ttl=window_ttl("squid_rollup", end_date)))
+
+
+@st.cache_resource
+def get_rollup_store():
+    return RollupStore("squid_rollup", fetch_rollup)
+
+
+def fetch_users(start_date, end_date):
+    query, params = build_users_query(start_date, end_date)
+    return normalize_users(read_sql(query, params, ttl=window_ttl("squid_users", end_date)))
+
+
+@st.cache_resource
+def get_users_store():
+    return RollupStore("squid_users", fetch_users)
+
+
+def windows(start_date, end_date):
+    """``(rollup, users)`` for the window, loading both stores concurrently."""
+    return tuple(run_concurrently([
+        (get_rollup_store().window, (start_date, end_date)),
+        (get_users_store().window, (start_date, end_date)),
+    ]))
+
+
+# --- Local Aggregations -------------------------------------------------------------------------------------------
+def _side(users, chain_column):
+    return users[users["chain_column"] == chain_column]
+
+
+@profiler.timed("pandas")
+def kpis(rollup, users):
+    return pd.DataFrame({
+        "NUMBER_OF_TRANSFERS": [rollup["transfers"].sum()],
+        "NUMBER_OF_USERS": [hll.count_distinct(_side(users, "source_chain")["users"])],
+        "VOLUME_OF_TRANSFERS": [rollup["volume_usd"].sum().round()],
+    })
+
+
+@profiler.timed("pandas")
+def time_series(rollup, users, timeframe):
+    grouped = rollup.groupby(truncate_dates(rollup["day"], timeframe).rename("DATE"))
+    df = grouped.agg(
+        NUMBER_OF_TRANSFERS=("transfers", "sum"),
+        VOLUME_OF_TRANSFERS=("volume_usd", "sum"),
+    ).reset_index()
+    sources = _side(users, "source_chain")
+    counts = hll.count_distinct_by(truncate_dates(sources["day"], timeframe), sources["users"])
+    df.insert(2, "NUMBER_OF_USERS", counts.reindex(df["DATE"], fill_value=0).to_numpy())
+    df["VOLUME_OF_TRANSFERS"] = df["VOLUME_OF_TRANSFERS"].round()
+    return df.sort_values("DATE", ignore_index=True)
+
+
+def by_chain(rollup, users, chain_column, label):
+    df = rollup.groupby(chain_column, dropna=False).agg(**{
+        "Number of Transfers": ("transfers", "sum"),
+        "Volume of Transfers (USD)": ("volume_usd", "sum"),
+    }).reset_index()
+    side = _side(users, chain_column)
+    counts = hll.count_distinct_by(side["chain"], side["users"])
+    df.insert(2, "Number of Users", counts.reindex(df[chain_column], fill_value=0).to_numpy())
+    df = df.rename(columns={chain_column: label})
+    df["Volume of Transfers (USD)"] = df["Volume of Transfers (USD)"].round()
+    return df.sort_values("Number of Transfers", ascending=False, ignore_index=True)
+
+
+@profiler.timed("pandas")
+def top_chains(rollup, users, chain_column, label, n):
+    """Top ``n`` chains for each of ``TOP_N_METRICS``, largest first, with the rest as one "Other" row.
+
+    All three rankings come from one ``by_chain`` aggregation and one ``rank``
+    call. The "Other" user count is the distinct count over the tail chains'
+    sketches, not a sum of per-chain counts.
+    """
+    df = by_chain(rollup, users, chain_column, label)
+    ranks = df[TOP_N_METRICS].rank(method="first", ascending=False)
+    tops = {}
+    for metric in TOP_N_METRICS:
+        in_top = ranks[metric] <= n
+        top = df.loc[in_top, [label, metric]].sort_values(metric, ascending=False, ignore_index=True)
+        if not in_top.all():
+            if metric == "Number of Users":
+                side = _side(users, chain_column)
+                other = hll.count_distinct(side.loc[side["chain"].isin(df.loc[~in_top, label]), "users"])
+            else:
+                other = df.loc[~in_top, metric].sum()
+            top.loc[len(top)] = [OTHER_CHAIN, other]
+        tops[metric] = top
+    return tops
+
+
+@profiler.timed("pandas")
+def by_chain_symbol(rollup, chain_column, label, top_symbols=None):
+    """Transfers and volume per chain x symbol.
+
+    With ``top_symbols`` set, symbols outside the ``top_symbols`` busiest ones
+    (by transfers over the whole window) are folded into a single "Other".
+    """
+    symbols = rollup["symbol"]
+    if top_symbols is not None:
+        top = rollup.groupby("symbol")["transfers"].sum().nlargest(top_symbols).index
+        symbols = symbols.where(symbols.isin(top), OTHER_SYMBOL)
+    df = rollup.groupby([rollup[chain_column], symbols], dropna=False).agg(**{
+        "Volume of Transfers (USD)": ("volume_usd", "sum"),
+        "Number of Transfers": ("transfers", "sum"),
+    }).reset_index().rename(columns={chain_column: label, "symbol": "Symbol"})
+    df["Volume of Transfers (USD)"] = df["Volume of Transfers (USD)"].round()
+    return df.sort_values("Number of Transfers", ascending=False, ignore_index=True)
+
+
+@profiler.timed("pandas")
+def add_symbol_shares(df, label):
+    """Add each symbol's % of its chain's transfers and volume, in place."""
+    values = df[list(SHARE_COLUMNS)]
+    totals = values.groupby(df[label], dropna=False).transform("sum")
+    shares = values.div(totals).mul(100)
+    for column, share_column in SHARE_COLUMNS.items():
+        df[share_column] = shares[column]
+    return df
@@ -0,0 +1,90 @@
+"""Typed staging CTEs over the VARIANT ``data`` column of the axelscan tables.
+
+Reading ``data:send:amount`` safely took three evaluations of the path per
+row (``IS_ARRAY``, ``IS_OBJECT``, then ``TRY_TO_DOUBLE(...::STRING)``), and
+``amount_usd`` and the GMP fee repeated the whole chain for every operand.
+A ``Stage`` renders two CTEs instead:
+
+* ``<name>_variants`` scans the table with its raw range and row filters and
+  extracts each declared path once, as a VARIANT column;
+* ``<name>`` casts those columns once: ``STRING`` paths to text, ``DOUBLE``
+  paths to a number, or ``NULL`` when the value is an array, an object or
+  not numeric.
+
+Queries then do arithmetic on plain typed columns. The Squid activity query
+builds its branches on ``squid_transfers`` and ``squid_gmp`` (see
+``shared.squid``). The stages are CTEs inside each template, not a view,
+because the dashboard's role is read-only and the date range has to stay
+next to the scan for partition pruning (see ``query_builder.check_prunable``).
+"""
+FACT_TRANSFERS = "axelar.axelscan.fact_transfers"
+FACT_GMP = "axelar.axelscan.fact_gmp"
+
+STRING = "string"
+DOUBLE = "double"
+
+_CASTS = {
+    STRING: "{column}::STRING",
+    DOUBLE: "IFF(IS_ARRAY({column}) OR IS_OBJECT({column}), NULL, TRY_TO_DOUBLE({column}::STRING))",
+}
+
+# typed column -> (VARIANT path, type)
+TRANSFER_FIELDS = {
+    "source_chain": ("data:send:original_source_chain", STRING),
+    "destination_chain": ("data:send:original_destination_chain", STRING),
+    "amount": ("data:send:amount", DOUBLE),
+    "fee_value": ("data:send:fee_value", DOUBLE),
+    "price": ("data:link:price", DOUBLE),
+    "asset": ("data:link:asset", STRING),
+}
+
+GMP_FIELDS = {
+    "source_chain": ("data:call.chain", STRING),
+    "destination_chain": ("data:call.returnValues.destinationChain", STRING),
+    "sender": ("data:call.transaction.from", STRING),
+    "value": ("data:value", DOUBLE),
+    "gas_used_amount": ("data:gas:gas_used_amount", DOUBLE),
+    "token_price_usd": ("data:gas_price_rate:source_token.token_price.usd", DOUBLE),
+    "express_fee_usd": ("data:fees:express_fee_usd", DOUBLE),
+    "symbol": ("data:symbol", STRING),
+}
+
+
+class Stage:
+    """Filtered scan of ``table`` with ``columns`` passed through and ``fields`` parsed once and typed."""
+
+    def __init__(self, name, table, columns, fields, where):
+        self.name = name
+        self.table = table
+        self.columns = list(columns)
+        self.fields = dict(fields)
+        self.where = list(where)
+        unknown = {kind for _, kind in self.fields.values()} - set(_CASTS)
+        if unknown:
+            raise ValueError(f"Stage {name!r} has fields of unknown type: {sorted(unknown)}")
+
+    def sql(self):
+        """The two CTE definitions, to follow ``WITH`` (or a comma) in a query."""
+        extract = ",\n        ".join(
+            self.columns + [f"{path} AS {column}" for column, (path, _) in self.fields.items()]
+        )
+        typed = ",\n        ".join(
+            self.columns + [f"{_CASTS[kind].format(column=column)} AS {column}"
+                            for column, (_, kind) in self.fields.items()]
+        )
+        where = "\n      AND ".join(self.where)
+        return f"""{self.name}_variants AS (
+    SELECT
+        {extract}
+    FROM {self.table}
+    WHERE {where}
+),
+{self.name} AS (
+    SELECT
+        {typed}
+    FROM {self.name}_variants
+)"""
+
+
+def ctes(*stages):
+    return ",\n".join(stage.sql() for stage in stages)
@@ -0,0 +1,198 @@
+"""Seeded synthetic Axelar/Squid data for the local warehouse.
+
+Builds the five fact tables the pages query, under the same
+``axelar.<schema>.<table>`` names, inside a DuckDB database:
+
+* ``axelar.core.fact_blocks`` - one block every few seconds over the span;
+* ``axelar.core.fact_transactions`` - skewed senders, ~3% failures;
+* ``axelar.stats.ez_core_metrics_hourly`` - rolled up from the transactions,
+  so the pre-aggregated and exact KPI paths agree;
+* ``axelar.axelscan.fact_transfers`` / ``fact_gmp`` - ``data`` VARIANT
+  payloads (JSON) with the paths the Squid query reads, a share of them sent
+  through the Squid contracts and a few malformed amounts.
+
+``rows`` is the total across the fact tables (70% transactions, 10% each for
+the rest). Every value is derived from ``hash(row, seed, table, draw)``, so a seed
+reproduces the same data whatever the thread count, and generation stays in
+SQL, so 1M-100M rows never pass through Python.
+
+    python -m shared.synthetic --rows 1000000 --out .cache/axelar.duckdb
+"""
+import argparse
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from shared.squid import CONTRACTS_FILE, SYMBOLS_FILE
+
+DEFAULT_ROWS = 1_000_000
+DEFAULT_SEED = 42
+DEFAULT_START_DATE = "2024-01-01"
+DEFAULT_END_DATE = "2025-07-31"
+
+SHARES = {"fact_transactions": 0.7, "fact_blocks": 0.1, "fact_transfers": 0.1, "fact_gmp": 0.1}
+
+CHAINS = [
+    "ethereum", "arbitrum", "base", "polygon", "avalanche", "binance", "optimism", "osmosis", "moonbeam",
+    "fantom", "celo", "kava", "filecoin", "linea", "scroll", "blast", "mantle", "fraxtal", "immutable",
+    "centrifuge", "neutron", "injective", "sei", "kujira", "juno",
+]
+
+SQUID_SHARE = 0.4  # share of transfers / GMP calls routed through a Squid contract
+
+
+def _list_literal(values):
+    return "[" + ", ".join("'" + value.replace("'", "''") + "'" for value in values) + "]"
+
+
+def _raw_assets():
+    symbols = pd.read_csv(SYMBOLS_FILE, dtype=str, keep_default_na=False)["raw_asset"]
+    # prefix rules ("factory/sei10hub*") get one concrete id; a few ids have no symbol at all
+    return [raw.replace("*", "example/seilor") for raw in symbols] + ["unlisted-wei", "ufoo"]
+
+
+def _statements(rows, start_date, end_date, seed):
+    counts = {table: max(1, int(rows * share)) for table, share in SHARES.items()}
+    start = pd.Timestamp(start_date)
+    span = int((pd.Timestamp(end_date) + pd.Timedelta(days=1) - start).total_seconds())
+    users = max(1_000, counts["fact_transactions"] // 50)
+    contracts = pd.read_csv(CONTRACTS_FILE, dtype=str)["address"].tolist()
+    n_chains, n_assets, n_contracts = len(CHAINS), len(_raw_assets()), len(contracts)
+    chains, assets, contracts = _list_literal(CHAINS), _list_literal(_raw_assets()), _list_literal(contracts)
+
+    def pick(values, count, u):
+        # skewed towards the head of the list, like real chain and asset popularity
+        return f"{values}[1 + LEAST(CAST(POW({u}, 2) * {count} AS INTEGER), {count} - 1)]"
+
+    def address(prefix, u, hex_digits=40):
+        return f"'{prefix}' || LPAD(PRINTF('%x', CAST(POW({u}, 3) * {users} AS BIGINT)), {hex_digits}, '0')"
+
+    ts = f"TIMESTAMP '{start:%Y-%m-%d}' + TO_SECONDS(CAST(u(i, 1) * {span} AS BIGINT))"
+    squid_or_random = (
+        f"CASE WHEN u(i, 5) < {SQUID_SHARE} THEN {pick(contracts, n_contracts, 'u(i, 6)')} "
+        f"ELSE {address('0x', 'u(i, 6)')} END"
+    )
+
+    def uniform(table):
+        # u(i, k): the k-th uniform draw for row i of ``table``
+        return f"CREATE OR REPLACE TEMP MACRO u(i, k) AS (HASH(i, {seed}, '{table}', k) % 1000000) / 1000000.0"
+
+    return [
+        "CREATE SCHEMA IF NOT EXISTS core",
+        "CREATE SCHEMA IF NOT EXISTS stats",
+        "CREATE SCHEMA IF NOT EXISTS axelscan",
+        uniform("fact_blocks"),
+        f"""
+        CREATE OR REPLACE TABLE core.fact_blocks AS
+        SELECT
+            i + 1 AS block_id,
+            TIMESTAMP '{start:%Y-%m-%d}' + TO_MICROSECONDS(CAST(i * {span} * 1e6 / {counts['fact_blocks']} AS BIGINT)) AS block_timestamp
+        FROM RANGE({counts['fact_blocks']}) t(i)
+        """,
+        uniform("fact_transactions"),
+        f"""
+        CREATE OR REPLACE TABLE core.fact_transactions AS
+        SELECT
+            MD5(CAST(i AS VARCHAR) || '-{seed}') AS tx_id,
+            {ts} AS block_timestamp,
+            {address('axelar1', 'u(i, 2)', 38)} AS tx_from,
+            u(i, 4) >= 0.03 AS tx_succeeded,
+            CAST(1000 + POW(u(i, 3), 4) * 5000000 AS BIGINT) AS fee
+        FROM RANGE({counts['fact_transactions']}) t(i)
+        ORDER BY block_timestamp
+        """,
+        """
+        CREATE OR REPLACE TABLE stats.ez_core_metrics_hourly AS
+        SELECT
+            DATE_TRUNC('hour', block_timestamp) AS block_timestamp_hour,
+            COUNT(*) AS transaction_count,
+            COUNT(*) FILTER (WHERE tx_succeeded) AS transaction_count_success,
+            COUNT(*) FILTER (WHERE NOT tx_succeeded) AS transaction_count_failed,
+            SUM(fee) / 1e6 AS total_fees_native,
+            SUM(fee) / 1e6 * 0.6 AS total_fees_usd
+        FROM core.fact_transactions
+        GROUP BY 1
+        ORDER BY 1
+        """,
+        uniform("fact_transfers"),
+        f"""
+        CREATE OR REPLACE TABLE axelscan.fact_transfers AS
+        SELECT
+            {ts} AS created_at,
+            'transfer-' || CAST(i AS VARCHAR) AS id,
+            CASE WHEN u(i, 7) < 0.95 THEN 'executed' ELSE 'failed' END AS status,
+            CASE WHEN u(i, 8) < 0.97 THEN 'received' ELSE 'pending' END AS simplified_status,
+            {squid_or_random} AS sender_address,
+            {address('0x', 'u(i, 2)')} AS recipient_address,
+            JSON_OBJECT(
+                'send', JSON_OBJECT(
+                    'original_source_chain', {pick(chains, n_chains, 'u(i, 9)')},
+                    'original_destination_chain', {pick(chains, n_chains, 'u(i, 10)')},
+                    'amount', CASE WHEN u(i, 11) < 0.01 THEN JSON_ARRAY(1, 2) ELSE TO_JSON(ROUND(POW(u(i, 12), 3) * 50000, 4)) END,
+                    'fee_value', ROUND(u(i, 13) * 2, 4)
+                ),
+                'link', JSON_OBJECT(
+                    'price', ROUND(0.5 + u(i, 14) * 3, 4),
+                    'asset', {pick(assets, n_assets, 'u(i, 15)')}
+                )
+            ) AS data
+        FROM RANGE({counts['fact_transfers']}) t(i)
+        ORDER BY created_at
+        """,
+        uniform("fact_gmp"),
+        f"""
+        CREATE OR REPLACE TABLE axelscan.fact_gmp AS
+        SELECT
+            {ts} AS created_at,
+            'gmp-' || CAST(i AS VARCHAR) AS id,
+            CASE WHEN u(i, 7) < 0.95 THEN 'executed' ELSE 'error' END AS status,
+            CASE WHEN u(i, 8) < 0.97 THEN 'received' ELSE 'pending' END AS simplified_status,
+            JSON_OBJECT(
+                'call', JSON_OBJECT(
+                    'chain', {pick(chains, n_chains, 'u(i, 9)')},
+                    'returnValues', JSON_OBJECT('destinationChain', {pick(chains, n_chains, 'u(i, 10)')}),
+                    'transaction', JSON_OBJECT('from', {address('0x', 'u(i, 2)')})
+                ),
+                'value', CASE WHEN u(i, 11) < 0.01 THEN JSON_OBJECT('amount', 1) ELSE TO_JSON(ROUND(POW(u(i, 12), 3) * 80000, 4)) END,
+                'gas', JSON_OBJECT('gas_used_amount', ROUND(u(i, 13) * 0.01, 6)),
+                'gas_price_rate', JSON_OBJECT('source_token', JSON_OBJECT('token_price', JSON_OBJECT('usd', ROUND(1 + u(i, 14) * 3000, 2)))),
+                'fees', JSON_OBJECT('express_fee_usd', ROUND(u(i, 16), 4)),
+                'symbol', {pick(assets, n_assets, 'u(i, 15)')},
+                'approved', JSON_OBJECT('returnValues', JSON_OBJECT('contractAddress', {squid_or_random}))
+            ) AS data
+        FROM RANGE({counts['fact_gmp']}) t(i)
+        ORDER BY created_at
+        """,
+    ]
+
+
+def generate(path, rows=DEFAULT_ROWS, start_date=DEFAULT_START_DATE, end_date=DEFAULT_END_DATE, seed=DEFAULT_SEED):
+    """Write the synthetic fact tables to the DuckDB database at ``path`` (catalog ``axelar``)."""
+    import duckdb
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.stem != "axelar":
+        raise ValueError(f"The database file must be named axelar.duckdb so queries resolve axelar.*, got {path.name}")
+    with duckdb.connect(str(path)) as con:
+        for statement in _statements(rows, start_date, end_date, seed):
+            con.execute(statement)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=DEFAULT_ROWS, help="total rows across the fact tables")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--start", default=DEFAULT_START_DATE)
+    parser.add_argument("--end", default=DEFAULT_END_DATE)
+    parser.add_argument("--out", default=".cache/axelar.duckdb")
+    args = parser.parse_args(argv)
+    started = time.perf_counter()
+    path = generate(args.out, rows=args.rows, start_date=args.start, end_date=args.end, seed=args.seed)
+    print(f"Wrote {args.rows:,} rows to {path} in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
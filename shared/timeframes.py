@@ -0,0 +1,35 @@
+"""Pandas equivalents of the ``DATE_TRUNC`` granularities used by the pages."""
+import pandas as pd
+
+TIMEFRAMES = ["month", "week", "day"]
+
+# Snowflake's DATE_TRUNC: weeks start on Monday (WEEK_START = 0).
+TIMEFRAME_FREQ = {"month": "M", "week": "W-SUN", "day": "D"}
+
+
+def truncate_dates(dates, timeframe):
+    return dates.dt.to_period(TIMEFRAME_FREQ[timeframe]).dt.start_time
+
+
+def split_periods(timeframe, start_date, end_date):
+    """Split ``[start_date, end_date]`` into one ``(lo, hi)`` day span per period.
+
+    Interior spans cover their whole period; the first and last span are
+    clipped to the requested window, matching a ``DATE_TRUNC`` ... ``GROUP BY``
+    over the same filter.
+    """
+    start, end = pd.Timestamp(start_date).normalize(), pd.Timestamp(end_date).normalize()
+    spans = []
+    for period in pd.period_range(start, end, freq=TIMEFRAME_FREQ[timeframe]):
+        lo = max(period.start_time.normalize(), start)
+        hi = min(period.end_time.normalize(), end)
+        spans.append((lo, hi))
+    return spans
+
+
+def today():
+    return pd.Timestamp.now(tz="UTC").tz_localize(None).normalize()
+
+
+def period_start(date, timeframe):
+    return pd.Timestamp(date).to_period(TIMEFRAME_FREQ[timeframe]).start_time
@@ -0,0 +1,10 @@
+import pandas as pd
+
+from shared import benchmark, page
+
+
+def test_longest_default_range_is_the_pages_default_view():
+    start, end = benchmark._date_window(max(benchmark.DEFAULT_RANGES))
+    assert (pd.Timestamp(start), pd.Timestamp(end)) == (
+        pd.Timestamp(page.DEFAULT_START_DATE), pd.Timestamp(page.DEFAULT_END_DATE)
+    )
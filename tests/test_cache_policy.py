@@ -0,0 +1,75 @@
+import pandas as pd
+import pytest
+
+from shared import cache_policy
+from shared.cache_policy import LRUCache, cached, sizeof
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_policy.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_evicts_least_recently_used_past_max_entries():
+    cache = LRUCache("test_entries", max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now the least recently used
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_evicts_oldest_past_max_bytes():
+    frame = pd.DataFrame({"n": range(1_000)})
+    cache = LRUCache("test_bytes", max_bytes=int(2.5 * sizeof(frame)))
+    for key in "abc":
+        cache.set(key, frame)
+    assert cache.stats()["entries"] == 2 and cache.nbytes == 2 * sizeof(frame)
+    cache.set("d", frame)
+    assert [key for key in "abcd" if cache.get(key) is not None] == ["c", "d"]
+    assert cache.stats()["evictions"] == 2
+
+
+def test_replacing_a_key_keeps_the_byte_count_right():
+    cache = LRUCache("test_replace", max_bytes=10 ** 6)
+    cache.set("a", pd.DataFrame({"n": range(1_000)}))
+    cache.set("a", pd.DataFrame({"n": range(10)}))
+    assert cache.nbytes == sizeof(pd.DataFrame({"n": range(10)}))
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = LRUCache("test_ttl", ttl=60)
+    cache.set("default", 1)
+    cache.set("short", 2, ttl=10)
+    cache.set("forever", 3, ttl=None)
+    clock[0] += 30
+    assert (cache.get("default"), cache.get("short")) == (1, None)
+    clock[0] += 31
+    assert cache.get("default") is None
+    assert cache.get("forever") is None  # ttl=None falls back to the cache's ttl
+    stats = cache.stats()
+    assert (stats["expirations"], stats["entries"], stats["hits"]) == (3, 0, 1)
+
+
+def test_entries_without_any_ttl_never_expire(clock):
+    cache = LRUCache("test_no_ttl")
+    cache.set("a", 1)
+    clock[0] += 10 ** 9
+    assert cache.get("a") == 1
+
+
+def test_cached_calls_once_per_arguments():
+    calls = []
+
+    @cached("test_cached")
+    def load(start, end):
+        calls.append((start, end))
+        return len(calls)
+
+    assert load("2024-01-01", "2024-01-31") == load("2024-01-01", "2024-01-31") == 1
+    assert load("2024-02-01", "2024-02-29") == 2
+    assert load.cache.stats()["hits"] == 1
@@ -0,0 +1,26 @@
+import numpy as np
+import pandas as pd
+
+from shared.charts import lttb, lttb_indices
+
+
+def test_lttb_keeps_endpoints_and_budget():
+    x = np.arange(10_000)
+    y = np.sin(x / 100)
+    kept = lttb_indices(x, y, 500)
+    assert len(kept) == 500
+    assert kept[0] == 0 and kept[-1] == len(x) - 1
+    assert np.all(np.diff(kept) > 0)
+
+
+def test_lttb_keeps_spikes():
+    y = np.zeros(5_000)
+    y[1234] = 100.0
+    assert 1234 in lttb_indices(np.arange(len(y)), y, 100)
+
+
+def test_lttb_leaves_short_frames_alone():
+    df = pd.DataFrame({"Date": pd.date_range("2024-01-01", periods=50), "value": range(50)})
+    assert lttb(df, "Date", "value", 100) is df
+    assert lttb(df, "Date", "value", None) is df
+    assert len(lttb(df, "Date", "value", 10)) == 10
@@ -0,0 +1,16 @@
+from decimal import Decimal
+
+import pyarrow as pa
+
+from shared.connection import arrow_to_frame
+
+
+def test_decimals_become_int64_or_float64_by_scale():
+    table = pa.table({
+        "count": pa.array([Decimal(3), Decimal(4)], pa.decimal128(38, 0)),
+        "fees": pa.array([Decimal("1.25"), Decimal("0.5")], pa.decimal128(38, 2)),
+        "ts": pa.array([1, 2], pa.timestamp("ns")),
+    })
+    df = arrow_to_frame(table)
+    assert df.dtypes.astype(str).to_dict() == {"count": "int64", "fees": "float64", "ts": "datetime64[ns]"}
+    assert df["fees"].tolist() == [1.25, 0.5]
@@ -0,0 +1,58 @@
+import time
+
+import pandas as pd
+import pytest
+
+from shared.disk_cache import DiskCache, cache_key
+
+QUERY = "SELECT day, n FROM t WHERE day >= ? AND day < ?"
+PARAMS = ["2024-01-01", "2024-02-01"]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return DiskCache(tmp_path, default_ttl=3600)
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({"day": pd.date_range("2024-01-01", periods=3), "n": [1, 2, 3]})
+
+
+def _entry(cache, query=QUERY, params=PARAMS):
+    key = cache_key(query, params)
+    return cache.directory / f"{key}.arrow", cache.directory / f"{key}.json"
+
+
+def test_round_trip_ignores_whitespace(cache, frame):
+    cache.set(QUERY, frame, PARAMS)
+    pd.testing.assert_frame_equal(cache.get("SELECT day, n\n  FROM t WHERE day >= ? AND day < ?", PARAMS), frame)
+    assert cache.get(QUERY, ["2024-01-01", "2024-03-01"]) is None
+
+
+def test_corrupt_file_is_a_miss_and_removed(cache, frame):
+    cache.set(QUERY, frame, PARAMS)
+    data_path, meta_path = _entry(cache)
+    data_path.write_bytes(data_path.read_bytes()[:-8] + b"corrupt!")
+    assert cache.get(QUERY, PARAMS) is None
+    assert not data_path.exists() and not meta_path.exists()
+
+
+def test_expired_entry_is_a_miss_and_removed(cache, frame):
+    cache.set(QUERY, frame, PARAMS, ttl=-1)
+    data_path, meta_path = _entry(cache)
+    assert cache.expires_at(QUERY, PARAMS) < time.time()
+    assert cache.get(QUERY, PARAMS) is None
+    assert not data_path.exists() and not meta_path.exists()
+
+
+def test_purge_removes_expired_entries_only(cache, frame):
+    cache.set(QUERY, frame, PARAMS, ttl=-1)
+    cache.set(QUERY, frame, ["2024-02-01", "2024-03-01"])
+    # another writer's sidecar, half written
+    in_flight = cache.directory / "tmpabc123.tmp.json"
+    in_flight.write_text('{"sha256": ')
+    cache.purge_expired()
+    assert not any(path.exists() for path in _entry(cache))
+    assert all(path.exists() for path in _entry(cache, params=["2024-02-01", "2024-03-01"]))
+    assert in_flight.exists()
@@ -0,0 +1,51 @@
+import numpy as np
+
+from shared import hll
+
+
+def test_estimate_is_within_error_bounds():
+    values = [f"0x{i:040x}" for i in range(20_000)]
+    estimate = hll.count_distinct([hll.from_values(values)])
+    assert abs(estimate - len(values)) <= 4 * hll.RELATIVE_ERROR * len(values)
+
+
+def test_union_counts_overlap_once():
+    a = hll.from_values(range(0, 6_000))
+    b = hll.from_values(range(3_000, 9_000))
+    estimate = hll.count_distinct([a, b])
+    assert abs(estimate - 9_000) <= 4 * hll.RELATIVE_ERROR * 9_000
+
+
+def test_export_round_trip():
+    sketch = hll.from_values(range(500))
+    parsed = hll.from_export(hll.to_export(sketch))
+    np.testing.assert_array_equal(parsed.indices, sketch.indices)
+    np.testing.assert_array_equal(parsed.values, sketch.values)
+
+
+def test_dense_export_matches_sparse():
+    sketch = hll.from_values(range(500))
+    dense = np.zeros(hll.REGISTERS, dtype=int)
+    dense[sketch.indices] = sketch.values
+    parsed = hll.from_export({"version": 4, "precision": hll.PRECISION, "dense": dense.tolist()})
+    assert hll.count_distinct([parsed]) == hll.count_distinct([sketch])
+
+
+def test_empty_sketches_count_zero():
+    assert hll.count_distinct([]) == 0
+    assert hll.count_distinct([hll.from_export(None), hll.EMPTY]) == 0
+
+
+def test_grouped_counts_match_per_group_unions():
+    sketches = [hll.from_values(range(i * 200, i * 200 + 700)) for i in range(8)]
+    keys = ["a", "b", "a", None, "c", "b", None, "a"]
+    counts = hll.count_distinct_by(keys, sketches)
+    for key in ["a", "b", "c"]:
+        assert counts[key] == hll.count_distinct([s for k, s in zip(keys, sketches) if k == key])
+    assert counts[counts.index.isna()].item() == hll.count_distinct([sketches[3], sketches[6]])
+
+
+def test_estimate_accepts_one_register_array_per_row():
+    sketches = [hll.from_values(range(n)) for n in (0, 10, 5_000, 50_000)]
+    registers = hll.union_by(range(len(sketches)), sketches, len(sketches))
+    assert hll.estimate(registers).tolist() == [hll.count_distinct([s]) for s in sketches]
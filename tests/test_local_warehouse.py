@@ -0,0 +1,24 @@
+from shared.local_warehouse import translate
+
+
+def test_variant_paths_become_json_extracts():
+    assert translate("SELECT data:send:amount, data:call.chain::STRING FROM t") == (
+        "SELECT json_extract_string(data, '$.send.amount'), json_extract_string(data, '$.call.chain') FROM t"
+    )
+
+
+def test_hll_accumulate_becomes_hash_udf():
+    assert translate("SELECT HLL_EXPORT(HLL_ACCUMULATE(LOWER(sender))) AS senders FROM t") == (
+        "SELECT hll_export_hashes(LIST(HASH(LOWER(sender))) FILTER (WHERE (LOWER(sender)) IS NOT NULL)) "
+        "AS senders FROM t"
+    )
+
+
+def test_date_functions_are_renamed():
+    assert translate("SELECT DATEDIFF(second, a, b), DATE_PART(epoch_second, c) FROM t") == (
+        "SELECT date_diff('second', a, b), epoch( c) FROM t"
+    )
+
+
+def test_string_casts_become_varchar():
+    assert translate("SELECT x::STRING FROM t") == "SELECT x::VARCHAR FROM t"
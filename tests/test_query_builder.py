@@ -0,0 +1,80 @@
+import pytest
+
+from shared import chain_stats, query_builder, squid  # noqa: F401  (registers the templates)
+from shared.query_builder import TEMPLATES, check_prunable
+from shared.timeframes import TIMEFRAMES
+
+LITERALS = {
+    "timeframe": TIMEFRAMES,
+    "squid_contracts": [squid._contracts_literal()],
+}
+
+
+def _literal_combinations(template):
+    combinations = [{}]
+    for field in dict.fromkeys(template.fields):
+        if field in query_builder.BIND_FIELDS:
+            continue
+        combinations = [dict(c, **{field: value}) for c in combinations for value in LITERALS[field]]
+    return combinations
+
+
+def test_modules_register_their_templates():
+    assert {"squid_activity", "squid_rollup", "squid_users", "chain_stats", "hourly_totals", "address_sketches", "block_summary",
+            "txn_metrics"} <= set(TEMPLATES)
+
+
+@pytest.mark.parametrize("name", sorted(TEMPLATES))
+def test_every_template_compiles_prunable(name):
+    template = TEMPLATES[name]
+    for literals in _literal_combinations(template):
+        assert check_prunable(template.compile(**literals))
+
+
+@pytest.mark.parametrize("name", sorted(TEMPLATES))
+def test_bind_params_match_placeholders(name):
+    template = TEMPLATES[name]
+    for literals in _literal_combinations(template):
+        sql, params = template.render("2025-01-01", "2025-01-31", **literals)
+        assert len(params) == sql.count("?")
+        assert set(params) == {"2025-01-01", "2025-02-01"}
+
+
+def test_cast_date_filter_is_rejected():
+    query = "SELECT 1 FROM axelar.axelscan.fact_transfers WHERE created_at::date >= ? AND created_at < ?"
+    with pytest.raises(ValueError, match="cast column"):
+        check_prunable(query)
+
+
+def test_outer_only_range_is_rejected():
+    query = """
+    SELECT * FROM (
+        SELECT created_at FROM axelar.axelscan.fact_transfers
+        UNION ALL
+        SELECT created_at FROM axelar.axelscan.fact_gmp
+    )
+    WHERE created_at >= ? AND created_at < ?
+    """
+    with pytest.raises(ValueError, match="2 fact tables but only has 1"):
+        check_prunable(query)
+
+
+def test_range_inside_every_branch_is_accepted():
+    query = """
+    SELECT created_at FROM axelar.axelscan.fact_transfers WHERE created_at >= ? AND created_at < ?
+    UNION ALL
+    SELECT created_at FROM axelar.axelscan.fact_gmp WHERE created_at >= ? AND created_at < ?
+    """
+    assert check_prunable(query) == query
+
+
+def test_unknown_literal_is_rejected():
+    template = query_builder.QueryTemplate("test_literal", "SELECT DATE_TRUNC('{timeframe}', x) FROM t")
+    with pytest.raises(ValueError, match="Rejected literal"):
+        template.compile(timeframe="year'; DROP TABLE t; --")
+    with pytest.raises(KeyError):
+        template.compile()
+
+
+def test_date_bounds_are_half_open():
+    assert query_builder.date_bounds("2025-01-01", "2025-01-31") == ("2025-01-01", "2025-02-01")
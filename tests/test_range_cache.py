@@ -0,0 +1,70 @@
+import datetime
+
+import pandas as pd
+from streamlit.testing.v1 import AppTest
+
+from shared.range_cache import RangeCache
+from shared.timeframes import truncate_dates
+
+
+def _periods(timeframe, start, end):
+    days = pd.DataFrame({"Date": pd.date_range(start, end), "n": 1})
+    days["Date"] = truncate_dates(days["Date"], timeframe)
+    return days.groupby("Date", as_index=False)["n"].sum()
+
+
+def _running_total(df):
+    return df.assign(total=df["n"].cumsum())
+
+
+def _cache(name, calls, fetch=_periods):
+    def recording_fetch(timeframe, start, end):
+        calls.append((start, end))
+        return fetch(timeframe, start, end)
+    return RangeCache(name, recording_fetch, finalize=_running_total)
+
+
+def test_range_cache_reuses_overlapping_periods():
+    calls = []
+    cache = _cache("test_range_cache", calls)
+    first = cache.get("month", "2024-01-01", "2024-03-31")
+    assert first["n"].tolist() == [31, 29, 31]
+    second = cache.get("month", "2024-02-01", "2024-04-30")
+    assert second["n"].tolist() == [29, 31, 30]
+    assert second["total"].tolist() == [29, 60, 90]
+    assert calls[-1] == (pd.Timestamp("2024-04-01"), pd.Timestamp("2024-04-30"))
+    assert len(calls) == 2
+
+
+def test_inverted_range_is_empty_with_finalized_columns():
+    cache = _cache("test_range_cache_inverted", [])
+    df = cache.get("week", "2024-03-31", "2024-01-01")
+    assert df.empty
+    assert list(df.columns) == ["Date", "n", "total"]
+
+
+def test_range_without_rows_is_empty_with_finalized_columns():
+    cache = _cache("test_range_cache_empty", [], fetch=lambda timeframe, start, end: _periods(timeframe, start, end)[:0])
+    df = cache.get("month", "2024-01-01", "2024-03-31")
+    assert df.empty
+    assert list(df.columns) == ["Date", "n", "total"]
+
+
+def _date_range_app():
+    import streamlit as st
+
+    from shared import page
+
+    start_date, end_date = page.date_range()
+    st.write(f"{start_date}..{end_date}")
+
+
+def test_date_range_swaps_an_inverted_window():
+    at = AppTest.from_function(_date_range_app)
+    at.run()
+    at.date_input[0].set_value(datetime.date(2025, 3, 1))
+    at.date_input[1].set_value(datetime.date(2025, 1, 1))
+    at.run()
+    assert not at.exception
+    assert len(at.warning) == 1
+    assert at.markdown[-1].value == "2025-01-01..2025-03-01"
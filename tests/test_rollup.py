@@ -0,0 +1,59 @@
+import pandas as pd
+import pytest
+
+from shared.rollup import RollupStore
+from shared.scheduler import QueryScheduler
+
+
+def _daily(start, end):
+    days = pd.date_range(start, end)
+    return pd.DataFrame({"day": days, "n": range(len(days))})
+
+
+def test_rollup_store_only_fetches_days_it_has_not_seen():
+    calls = []
+
+    def fetch(start, end):
+        calls.append((start, end))
+        return _daily(start, end)
+
+    store = RollupStore("test_rollup", fetch)
+    assert len(store.window("2024-01-10", "2024-01-20")) == 11
+    assert len(store.window("2024-01-12", "2024-01-15")) == 4
+    assert len(store.window("2024-01-05", "2024-01-25")) == 21
+    assert calls == [
+        (pd.Timestamp("2024-01-10"), pd.Timestamp("2024-01-20")),
+        (pd.Timestamp("2024-01-05"), pd.Timestamp("2024-01-09")),
+        (pd.Timestamp("2024-01-21"), pd.Timestamp("2024-01-25")),
+    ]
+    assert store.stats()["hits"] == 1
+
+
+def test_rollup_store_fetches_once_for_concurrent_callers():
+    calls = []
+
+    def fetch(start, end):
+        calls.append((start, end))
+        return _daily(start, end)
+
+    store = RollupStore("test_rollup_concurrent", fetch)
+    # more callers than the pool has threads, all needing the same range
+    futures = [QueryScheduler().submit(f"window {i}", store.window, "2024-02-01", "2024-02-29") for i in range(12)]
+    assert [len(f.result(timeout=30)) for f in futures] == [29] * 12
+    assert len(calls) == 1
+
+
+def test_rollup_store_failed_fetch_is_retried():
+    attempts = []
+
+    def fetch(start, end):
+        attempts.append((start, end))
+        if len(attempts) == 1:
+            raise RuntimeError("warehouse unavailable")
+        return _daily(start, end)
+
+    store = RollupStore("test_rollup_retry", fetch)
+    with pytest.raises(RuntimeError):
+        store.window("2024-03-01", "2024-03-05")
+    assert len(store.window("2024-03-01", "2024-03-05")) == 5
+    assert len(attempts) == 2
@@ -0,0 +1,47 @@
+import threading
+from types import SimpleNamespace
+
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+from shared.scheduler import DEFAULT_MAX_WORKERS, QueryScheduler, _InlineExecutor
+
+
+def _session():
+    # the fields add_script_run_ctx reads from a real ScriptRunContext
+    return SimpleNamespace(pages_manager=SimpleNamespace(main_script_hash="test"))
+
+
+def _ctx_seen(executor=None, n=2 * DEFAULT_MAX_WORKERS):
+    scheduler = QueryScheduler(executor)
+    for i in range(n):
+        scheduler.submit(i, get_script_run_ctx, True)
+    return {id(scheduler.result(i)) for i in range(n)}
+
+
+def _in_session(session, fn):
+    # a fresh thread, so the test runner's main thread never gets a context
+    result = {}
+    thread = add_script_run_ctx(threading.Thread(target=lambda: result.update(value=fn())), session)
+    thread.start()
+    thread.join()
+    return result["value"]
+
+
+def test_tasks_run_under_the_submitting_session_only():
+    first, second = _session(), _session()
+    assert _in_session(first, _ctx_seen) == {id(first)}
+    # the same pool threads now serve another session
+    assert _in_session(second, _ctx_seen) == {id(second)}
+    # and work from outside any session never sees one
+    assert _ctx_seen() == {id(None)}
+
+
+def test_inline_tasks_keep_the_callers_context():
+    session = _session()
+
+    def run_inline():
+        scheduler = QueryScheduler(_InlineExecutor())
+        scheduler.submit("task", get_script_run_ctx, True)
+        return scheduler.result("task"), get_script_run_ctx(suppress_warning=True)
+
+    assert _in_session(session, run_inline) == (session, session)
@@ -0,0 +1,20 @@
+import pytest
+
+from shared.settings import settings
+
+
+@pytest.mark.parametrize("value, enabled", [("1", True), ("yes", True), ("0", False), ("false", False), ("", False)])
+def test_env_flag_overrides_enabled(monkeypatch, value, enabled):
+    monkeypatch.setenv("AXELAR_TEST_FLAG", value)
+    assert settings("test_section", env_flag="AXELAR_TEST_FLAG") == {"enabled": enabled}
+
+
+def test_unset_env_leaves_section_alone(monkeypatch):
+    monkeypatch.delenv("AXELAR_TEST_FLAG", raising=False)
+    monkeypatch.setenv("AXELAR_TEST_PATH", "")
+    assert settings("test_section", env_flag="AXELAR_TEST_FLAG", path="AXELAR_TEST_PATH") == {}
+
+
+def test_env_overrides_keys(monkeypatch):
+    monkeypatch.setenv("AXELAR_TEST_PATH", "/tmp/axelar.duckdb")
+    assert settings("test_section", path="AXELAR_TEST_PATH") == {"path": "/tmp/axelar.duckdb"}
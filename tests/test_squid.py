@@ -0,0 +1,218 @@
+import pandas as pd
+import pytest
+
+from shared import hll, squid
+
+# every exact WHEN of the CASE the Squid page used before the registry (raw_asset -> Symbol)
+BASELINE_CASE = [
+    ('arb-wei', 'ARB'),
+    ('avalanche-uusdc', 'Avalanche USDC'),
+    ('avax-wei', 'AVAX'),
+    ('bnb-wei', 'BNB'),
+    ('busd-wei', 'BUSD'),
+    ('cbeth-wei', 'cbETH'),
+    ('cusd-wei', 'cUSD'),
+    ('dai-wei', 'DAI'),
+    ('dot-planck', 'DOT'),
+    ('eeur', 'EURC'),
+    ('ern-wei', 'ERN'),
+    ('eth-wei', 'ETH'),
+    ('fil-wei', 'FIL'),
+    ('frax-wei', 'FRAX'),
+    ('ftm-wei', 'FTM'),
+    ('glmr-wei', 'GLMR'),
+    ('hzn-wei', 'HZN'),
+    ('link-wei', 'LINK'),
+    ('matic-wei', 'MATIC'),
+    ('mkr-wei', 'MKR'),
+    ('mpx-wei', 'MPX'),
+    ('oath-wei', 'OATH'),
+    ('op-wei', 'OP'),
+    ('orbs-wei', 'ORBS'),
+    ('factory/sei10hud5e5er4aul2l7sp2u9qp2lag5u4xf8mvyx38cnjvqhlgsrcls5qn5ke/seilor', 'SEILOR'),
+    ('pepe-wei', 'PEPE'),
+    ('polygon-uusdc', 'Polygon USDC'),
+    ('reth-wei', 'rETH'),
+    ('ring-wei', 'RING'),
+    ('shib-wei', 'SHIB'),
+    ('sonne-wei', 'SONNE'),
+    ('stuatom', 'stATOM'),
+    ('uatom', 'ATOM'),
+    ('uaxl', 'AXL'),
+    ('ukuji', 'KUJI'),
+    ('ulava', 'LAVA'),
+    ('uluna', 'LUNA'),
+    ('ungm', 'NGM'),
+    ('uni-wei', 'UNI'),
+    ('uosmo', 'OSMO'),
+    ('usomm', 'SOMM'),
+    ('ustrd', 'STRD'),
+    ('utia', 'TIA'),
+    ('uumee', 'UMEE'),
+    ('uusd', 'USTC'),
+    ('uusdc', 'USDC'),
+    ('uusdt', 'USDT'),
+    ('vela-wei', 'VELA'),
+    ('wavax-wei', 'WAVAX'),
+    ('wbnb-wei', 'WBNB'),
+    ('wbtc-satoshi', 'WBTC'),
+    ('weth-wei', 'WETH'),
+    ('wfil-wei', 'WFIL'),
+    ('wftm-wei', 'WFTM'),
+    ('wglmr-wei', 'WGLMR'),
+    ('wmai-wei', 'WMAI'),
+    ('wmatic-wei', 'WMATIC'),
+    ('wsteth-wei', 'wstETH'),
+    ('yield-eth-wei', 'yieldETH'),
+]
+
+
+@pytest.mark.parametrize("raw_asset, symbol", BASELINE_CASE)
+def test_registry_matches_baseline_case(raw_asset, symbol):
+    assert squid._symbol_for(raw_asset) == symbol
+
+
+@pytest.mark.parametrize("raw_asset", [
+    "factory/sei10hub",
+    "factory/sei10hubabc/seilor",
+    "FACTORY/SEI10HUBXYZ",  # ILIKE
+])
+def test_sei10hub_prefix_maps_to_seilor(raw_asset):
+    assert squid._symbol_for(raw_asset) == "SEILOR"
+
+
+@pytest.mark.parametrize("raw_asset", ["unknown-wei", "factory/sei10hu", "USDC-WEI", ""])
+def test_unknown_assets_fall_back_to_raw_asset(raw_asset):
+    assert squid._symbol_for(raw_asset) == raw_asset
+
+
+def test_to_symbols_maps_each_row_and_keeps_missing():
+    raw_assets = pd.Series(["uusdc", "factory/sei10hubq", "unknown-wei", None, "uusdc"])
+    expected = pd.Series(["USDC", "SEILOR", "unknown-wei", None, "USDC"])
+    pd.testing.assert_series_equal(squid.to_symbols(raw_assets), expected)
+
+
+def test_load_contracts_strips_and_lowercases(tmp_path):
+    path = tmp_path / "contracts.csv"
+    path.write_text("address,label\n 0xCE16F69375520ab01377ce7B88f5BA8C48F8D666 ,Squid\n")
+    assert squid.load_contracts(path) == {"0xce16f69375520ab01377ce7b88f5ba8c48f8d666": "Squid"}
+
+
+@pytest.mark.parametrize("address", [
+    "ce16f69375520ab01377ce7b88f5ba8c48f8d666",  # no 0x
+    "0xce16f69375520ab01377ce7b88f5ba8c48f8d66",  # 39 digits
+    "0xce16f69375520ab01377ce7b88f5ba8c48f8d6666",  # 41 digits
+    "0xzz16f69375520ab01377ce7b88f5ba8c48f8d666",
+    "0xce16f693 5520ab01377ce7b88f5ba8c48f8d666",
+])
+def test_load_contracts_rejects_invalid_addresses(tmp_path, address):
+    path = tmp_path / "contracts.csv"
+    path.write_text(f"address,label\n0xe6B3949F9bBF168f4E3EFc82bc8FD849868CC6d8,ok\n{address},bad\n")
+    with pytest.raises(ValueError, match="Invalid contract address"):
+        squid.load_contracts(path)
+
+
+def test_shipped_contracts_are_lowercased():
+    assert len(squid.SQUID_CONTRACTS) == 5
+    assert all(address == address.lower() for address in squid.SQUID_CONTRACTS)
+
+
+# four source chains into one destination; c and d share 100 of their 200 users each
+CHAIN_USERS = {"a": range(0, 400), "b": range(400, 700), "c": range(1000, 1200), "d": range(1100, 1300)}
+CHAIN_TRANSFERS = {"a": 40, "b": 30, "c": 20, "d": 10}
+
+
+def small_rollup():
+    return pd.DataFrame({
+        "day": pd.Timestamp("2024-01-01"),
+        "source_chain": list(CHAIN_TRANSFERS),
+        "destination_chain": "axelar",
+        "raw_asset": "uusdc",
+        "service": "squid",
+        "symbol": "USDC",
+        "transfers": list(CHAIN_TRANSFERS.values()),
+        "volume_usd": [transfers * 100.0 for transfers in CHAIN_TRANSFERS.values()],
+        "fee": 0.0,
+    })
+
+
+def small_users():
+    sources = pd.DataFrame({
+        "day": pd.Timestamp("2024-01-01"),
+        "chain_column": "source_chain",
+        "chain": list(CHAIN_USERS),
+        "users": [hll.from_values(users) for users in CHAIN_USERS.values()],
+    })
+    destinations = pd.DataFrame({
+        "day": [pd.Timestamp("2024-01-01")],
+        "chain_column": ["destination_chain"],
+        "chain": ["axelar"],
+        "users": [hll.from_values(range(0, 1300))],
+    })
+    return pd.concat([sources, destinations], ignore_index=True)
+
+
+def test_top_chains_folds_the_tail_into_other():
+    tops = squid.top_chains(small_rollup(), small_users(), "source_chain", "Source Chain", n=2)
+    transfers = tops["Number of Transfers"]
+    assert transfers["Source Chain"].tolist() == ["a", "b", squid.OTHER_CHAIN]
+    assert transfers["Number of Transfers"].tolist() == [40, 30, 30]
+    assert tops["Volume of Transfers (USD)"]["Volume of Transfers (USD)"].tolist() == [4000, 3000, 3000]
+
+
+def test_top_chains_other_users_is_the_union_of_the_tail():
+    users = small_users()
+    tops = squid.top_chains(small_rollup(), users, "source_chain", "Source Chain", n=2)
+    top = tops["Number of Users"]
+    assert top["Source Chain"].tolist() == ["a", "b", squid.OTHER_CHAIN]
+    other = top["Number of Users"].iloc[-1]
+    # c and d overlap, so the tail has ~300 distinct users rather than 200 + 200
+    tail = users.loc[users["chain"].isin(["c", "d"]), "users"]
+    assert other == hll.count_distinct(tail)
+    assert abs(other - 300) <= 4 * hll.RELATIVE_ERROR * 300
+
+
+def test_top_chains_without_a_tail_has_no_other_row():
+    tops = squid.top_chains(small_rollup(), small_users(), "source_chain", "Source Chain", n=4)
+    for top in tops.values():
+        assert squid.OTHER_CHAIN not in top["Source Chain"].tolist()
+        assert len(top) == 4
+
+
+def symbol_rollup():
+    # two chains; across both, USDC (60) > ETH (25) > ATOM (10) > OSMO (5) by transfers
+    rows = [
+        ("a", "USDC", 40, 400.0), ("a", "ETH", 20, 600.0), ("a", "ATOM", 5, 50.0), ("a", "OSMO", 5, 25.0),
+        ("b", "USDC", 20, 200.0), ("b", "ETH", 5, 150.0), ("b", "ATOM", 5, 50.0),
+    ]
+    df = pd.DataFrame(rows, columns=["source_chain", "symbol", "transfers", "volume_usd"])
+    df["day"] = pd.Timestamp("2024-01-01")
+    return df
+
+
+def test_by_chain_symbol_folds_minor_symbols_into_other():
+    df = squid.by_chain_symbol(symbol_rollup(), "source_chain", "Source Chain", top_symbols=2)
+    assert set(df["Symbol"]) == {"USDC", "ETH", squid.OTHER_SYMBOL}
+    other = df[df["Symbol"] == squid.OTHER_SYMBOL].set_index("Source Chain")
+    assert other.loc["a", "Number of Transfers"] == 10
+    assert other.loc["a", "Volume of Transfers (USD)"] == 75
+    assert other.loc["b", "Number of Transfers"] == 5
+    assert df["Number of Transfers"].sum() == symbol_rollup()["transfers"].sum()
+
+
+def test_by_chain_symbol_keeps_every_symbol_by_default():
+    df = squid.by_chain_symbol(symbol_rollup(), "source_chain", "Source Chain")
+    assert set(df["Symbol"]) == {"USDC", "ETH", "ATOM", "OSMO"}
+    assert len(df) == 7
+
+
+def test_symbol_shares_sum_to_100_per_chain():
+    df = squid.add_symbol_shares(
+        squid.by_chain_symbol(symbol_rollup(), "source_chain", "Source Chain", top_symbols=2), "Source Chain"
+    )
+    for share_column in squid.SHARE_COLUMNS.values():
+        totals = df.groupby("Source Chain")[share_column].sum()
+        assert totals.to_numpy() == pytest.approx([100, 100])
+    usdc_a = df[(df["Source Chain"] == "a") & (df["Symbol"] == "USDC")].iloc[0]
+    assert usdc_a["Number of Swaps %"] == pytest.approx(40 / 70 * 100)
+    assert usdc_a["Volume %"] == pytest.approx(400 / 1075 * 100)
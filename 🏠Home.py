@@ -1,11 +1,9 @@
 import streamlit as st
 
+from shared import page
+
 # --- Page Config: Tab Title & Icon ---
-st.set_page_config(
-    page_title="Axelar: An overview",
-    page_icon="https://img.cryptorank.io/coins/axelar1663924228506.png",
-    layout="wide" 
-)
+page.configure(data=False)
 
 # --- Title with Logo ------------------------------------------------------------------------------------------------------------------
 st.markdown(